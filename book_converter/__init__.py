@@ -6,7 +6,7 @@ __version__ = "1.0.0"
 
 from .converter import PDFConverter
 from .formats import EPUBConverter, DOCXConverter, HTMLConverter, TextConverter, MarkdownConverter, MOBIConverter
-from .chapter_patterns import ChapterDetector, CHAPTER_PATTERNS, CHAPTER_STYLES
+from .chapter_patterns import ChapterDetector, CombinedChapterDetector, CHAPTER_PATTERNS, CHAPTER_STYLES
 
 __all__ = [
     "PDFConverter", 
@@ -17,6 +17,7 @@ __all__ = [
     "MarkdownConverter",
     "MOBIConverter",
     "ChapterDetector",
+    "CombinedChapterDetector",
     "CHAPTER_PATTERNS",
     "CHAPTER_STYLES"
 ]
@@ -3,41 +3,56 @@ Chapter pattern detection and formatting for book conversion.
 """
 import re
 import logging
+from functools import lru_cache
 from typing import Optional, List, Dict, Tuple, Match
 
 logger = logging.getLogger(__name__)
 
+
+@lru_cache(maxsize=128)
+def _compile(pattern: str, flags: int) -> 're.Pattern':
+    """Compile a chapter pattern, reusing the result across detectors."""
+    return re.compile(pattern, flags)
+
+
 class ChapterDetector:
     """
     Detects and formats chapter openings in text using regular expressions.
     """
     
-    def __init__(self, pattern: str, style_class: str = "chapter-opening"):
+    def __init__(self, pattern: str, style_class: str = "chapter-opening", flags: int = re.MULTILINE):
         """
         Initialize the chapter detector.
         
         Args:
             pattern (str): Regex pattern to detect chapter openings
             style_class (str): CSS class to apply to the chapter opening
+            flags (int): Regex flags to compile the pattern with. Only MULTILINE is
+                set by default; pass re.DOTALL as well if '.' should match newlines.
         """
         self.pattern = pattern
         self.style_class = style_class
+        self.flags = flags
         self._compile_pattern()
     
     def _compile_pattern(self) -> None:
         """Compile the regex pattern."""
         try:
-            self.regex = re.compile(self.pattern, re.MULTILINE | re.DOTALL)
+            self.regex = _compile(self.pattern, self.flags)
         except re.error as e:
             logger.error(f"Invalid regex pattern: {e}")
             raise ValueError(f"Invalid chapter pattern: {e}")
     
-    def format_chapter_openings(self, text: str, chapter_title: Optional[str] = None) -> str:
+    def format_chapter_openings(self, text: str, chapter_title: Optional[str] = None,
+                                max_chars: Optional[int] = None) -> str:
         """
         Detect and format chapter openings in text.
         
         Args:
             text (str): Text content to process
+            chapter_title (Optional[str]): Title to remove from each opening
+            max_chars (Optional[int]): Only look for openings that start within the first
+                max_chars characters, leaving the rest of a long chapter unscanned
             
         Returns:
             str: Processed text with formatted chapter openings
@@ -45,23 +60,31 @@ class ChapterDetector:
         if not self.pattern:
             return text
             
-        # Find all matches, from last to first to avoid offset issues
-        matches = list(self.regex.finditer(text))
-        
-        # Process in reverse order
-        for match in reversed(matches):
+        # Walk the matches forward, collecting unchanged slices and styled openings
+        parts = []
+        last_end = 0
+        # The text is never cut at max_chars, so an opening that starts before the
+        # limit matches in full even when it runs past it; the scan stops at the
+        # first match starting beyond the limit
+        for match in self.regex.finditer(text):
+            if max_chars is not None and match.start() >= max_chars:
+                break
             opening = match.group(0)
             # If chapter_title is provided, remove it from the opening
             if chapter_title:
                 opening = opening.replace(chapter_title, "").strip()
                 
-            styled_opening = f'<div class="{self.style_class}">{opening}</div>'
-            
-            # Replace the matched text with the styled version
             start, end = match.span()
-            text = text[:start] + styled_opening + text[end:]
+            parts.append(text[last_end:start])
+            parts.append(f'<div class="{self._style_class_for(match)}">{opening}</div>')
+            last_end = end
             
-        return text
+        parts.append(text[last_end:])
+        return "".join(parts)
+    
+    def _style_class_for(self, match: Match) -> str:
+        """Return the CSS class to apply to a matched chapter opening."""
+        return self.style_class
     
     def extract_chapter_titles(self, text: str) -> List[str]:
         """
@@ -76,9 +99,47 @@ class ChapterDetector:
         if not self.pattern:
             return []
             
-        # Find all matches
-        matches = list(self.regex.finditer(text))
-        return [match.group(0) for match in matches]
+        return [match.group(0) for match in self.regex.finditer(text)]
+
+
+class CombinedChapterDetector(ChapterDetector):
+    """
+    Detects chapter openings for several named patterns in a single scan.
+    
+    The patterns are joined into one alternation of named groups, so each page
+    is scanned once regardless of how many styles are being detected. At any
+    position the alternatives are tried in order, so more specific patterns
+    should come first.
+    """
+    
+    def __init__(self, patterns: Optional[Dict[str, str]] = None,
+                 style_class: str = "chapter-opening",
+                 style_classes: Optional[Dict[str, str]] = None,
+                 flags: int = re.MULTILINE):
+        """
+        Initialize the combined chapter detector.
+        
+        Args:
+            patterns (Optional[Dict[str, str]]): Mapping of pattern name to regex,
+                defaults to all predefined patterns
+            style_class (str): CSS class for patterns without an entry in style_classes
+            style_classes (Optional[Dict[str, str]]): CSS class to apply per pattern name
+            flags (int): Regex flags to compile the combined pattern with
+        """
+        if patterns is None:
+            patterns = {name: CHAPTER_PATTERNS[name] for name in COMBINED_PATTERN_ORDER}
+        self.patterns = dict(patterns)
+        
+        style_classes = style_classes or {}
+        self.style_classes = {name: style_classes.get(name, style_class) for name in self.patterns}
+        
+        combined = "|".join(f"(?P<{name}>{pattern})" for name, pattern in self.patterns.items())
+        super().__init__(combined, style_class, flags)
+    
+    def _style_class_for(self, match: Match) -> str:
+        """Return the CSS class of the pattern that matched the opening."""
+        # The outer named group closes last, so lastgroup names the pattern
+        return self.style_classes[match.lastgroup]
 
 
 # Predefined chapter patterns
@@ -87,15 +148,21 @@ CHAPTER_PATTERNS = {
     "standard": r"Chapter\s+\d+(?:\s*:\s*[^\n]+)?\s*\n",
     
     # Pattern for chapters with quotes: "Chapter X: Title", quote, and ending with "~"
-    "quoted": r"Chapter\s+\d+(?:\s*:\s*[^\n]+)?\s*\n\s*\"[^\"]+\"\s*\n\s*~\s*",
+    # Line-local whitespace is spelled [ \t] so a failed match cannot drift across lines
+    "quoted": r'Chapter[ \t]+\d+(?:[ \t]*:[ \t]*[^\n]+)?[ \t]*\n[ \t]*"[^"]+"[ \t]*\n[ \t]*~',
     
     # Pattern for numbered chapters without the word "Chapter"
     "numbered": r"^\s*\d+\.\s+[^\n]+\s*$",
     
-    # Pattern for chapters with roman numerals
-    "roman": r"^\s*(?:I|II|III|IV|V|VI|VII|VIII|IX|X|XI|XII|XIII|XIV|XV|XVI|XVII|XVIII|XIX|XX)\.\s+[^\n]+\s*$",
+    # Pattern for chapters with roman numerals from I to XXXIX; the lookahead
+    # rules out the empty numeral, so only well-formed numerals match
+    "roman": r"^[ \t]*(?=[IVX])X{0,3}(?:IX|IV|V?I{0,3})\.[ \t]+[^\n]+$",
 }
 
+# Order in which CombinedChapterDetector tries the predefined patterns;
+# "quoted" must precede "standard" since the latter matches its first line
+COMBINED_PATTERN_ORDER = ("quoted", "standard", "numbered", "roman")
+
 # Default CSS styles for chapter openings
 CHAPTER_STYLES = {
     "standard": """
@@ -5,12 +5,14 @@ import os
 import sys
 import logging
 import argparse
-from typing import List, Optional
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Iterator, List, Optional
 from pathlib import Path
 import glob
 
 from . import __version__
 from .converter import PDFConverter
+from .utils import default_workers
 from .chapter_patterns import CHAPTER_PATTERNS, CHAPTER_STYLES
 
 # Configure logger
@@ -20,6 +22,18 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Output file extensions and the format each one selects
+_SUPPORTED_FORMATS = {
+    '.epub': 'epub',
+    '.docx': 'docx',
+    '.html': 'html',
+    '.htm': 'html',
+    '.txt': 'text',
+    '.md': 'markdown',
+    '.mobi': 'mobi'
+}
+_SUPPORTED_EXTENSIONS = ', '.join(_SUPPORTED_FORMATS)
+
 
 def parse_args(args: Optional[List[str]] = None) -> argparse.Namespace:
     """
@@ -144,7 +158,7 @@ Examples:
     batch_parser.add_argument(
         'inputs',
         nargs='+',
-        help='Input PDF files (supports wildcards)'
+        help='Input PDF files or directories (supports wildcards)'
     )
     batch_parser.add_argument(
         '--output-dir', '-o',
@@ -188,6 +202,11 @@ Examples:
         choices=list(CHAPTER_STYLES.keys()),
         help='Style to apply to detected chapter openings (standard, quoted, decorative)'
     )
+    batch_parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        help='Number of files to convert in parallel (default: number of CPUs)'
+    )
     batch_parser.add_argument(
         '--verbose', '-v',
         action='store_true',
@@ -212,23 +231,14 @@ def validate_output_format(output_path: str) -> str:
     """
     ext = os.path.splitext(output_path)[1].lower()
     
-    supported_formats = {
-        '.epub': 'epub',
-        '.docx': 'docx',
-        '.html': 'html',
-        '.htm': 'html',
-        '.txt': 'text',
-        '.md': 'markdown',
-        '.mobi': 'mobi'
-    }
-    
-    if ext not in supported_formats:
+    format_name = _SUPPORTED_FORMATS.get(ext)
+    if format_name is None:
         raise ValueError(
             f"Unsupported output format: {ext}\n"
-            f"Supported formats: {', '.join(supported_formats.keys())}"
+            f"Supported formats: {_SUPPORTED_EXTENSIONS}"
         )
         
-    return supported_formats[ext]
+    return format_name
 
 
 def convert_single_file(args: argparse.Namespace) -> int:
@@ -247,7 +257,7 @@ def convert_single_file(args: argparse.Namespace) -> int:
         
         # Check if input file exists
         if not os.path.exists(input_path):
-            logger.error(f"Input file not found: {input_path}")
+            logger.error("Input file not found: %s", input_path)
             return 1
             
         # Create output directory if it doesn't exist
@@ -262,9 +272,7 @@ def convert_single_file(args: argparse.Namespace) -> int:
         if args.verbose:
             logging.getLogger().setLevel(logging.DEBUG)
             
-        # Initialize the converter
-        logger.info(f"Converting {input_path} to {format_name.upper()}")
-        converter = PDFConverter(input_path, password=args.password)
+        logger.info("Converting %s to %s", input_path, format_name.upper())
         
         # Prepare conversion options
         options = {
@@ -275,53 +283,158 @@ def convert_single_file(args: argparse.Namespace) -> int:
         }
         
         # Add optional parameters if provided
-        if args.title:
-            options['title'] = args.title
-        if args.author:
-            options['author'] = args.author
-        if args.language:
-            options['language'] = args.language
-        if args.cover_image:
-            options['cover_image'] = args.cover_image
+        options.update({
+            key: value for key, value in (
+                ('title', args.title),
+                ('author', args.author),
+                ('language', args.language),
+                ('cover_image', args.cover_image),
+            ) if value
+        })
             
         # Handle chapter pattern options
         if args.chapter_pattern:
             options['chapter_pattern'] = args.chapter_pattern
-            logger.info(f"Using predefined chapter pattern: {args.chapter_pattern}")
+            logger.info("Using predefined chapter pattern: %s", args.chapter_pattern)
         elif args.custom_chapter_pattern:
             options['chapter_pattern'] = args.custom_chapter_pattern
-            logger.info(f"Using custom chapter pattern: {args.custom_chapter_pattern}")
+            logger.info("Using custom chapter pattern: %s", args.custom_chapter_pattern)
             
         # Handle chapter style
         if args.chapter_style:
             options['chapter_style_name'] = args.chapter_style
-            logger.info(f"Using chapter style: {args.chapter_style}")
+            logger.info("Using chapter style: %s", args.chapter_style)
             
-        # Perform the conversion
-        if format_name == 'epub':
-            converter.to_epub(output_path, **options)
-        elif format_name == 'docx':
-            converter.to_docx(output_path, **options)
-        elif format_name == 'html':
-            converter.to_html(output_path, **options)
-        elif format_name == 'text':
-            converter.to_text(output_path, **options)
-        elif format_name == 'markdown':
-            converter.to_markdown(output_path, **options)
-        elif format_name == 'mobi':
-            converter.to_mobi(output_path, **options)
+        # Perform the conversion, closing the PDF as soon as it is done
+        with PDFConverter(input_path, password=args.password, workers=default_workers()) as converter:
+            converter.convert(format_name, output_path, **options)
             
-        logger.info(f"Successfully converted to {output_path}")
+        logger.info("Successfully converted to %s", output_path)
         return 0
         
     except Exception as e:
-        logger.error(f"Error during conversion: {e}")
+        logger.error("Error during conversion: %s", e)
         if args.verbose:
             import traceback
             traceback.print_exc()
         return 1
 
 
+def _iter_pdfs(pattern: str) -> Iterator[str]:
+    """
+    Yield the PDF files matched by a single input pattern.
+    
+    Args:
+        pattern (str): File path, directory or glob pattern
+        
+    Yields:
+        str: Path of each matching PDF file
+    """
+    if os.path.isdir(pattern):
+        # scandir reports each entry's type without an extra stat call per file
+        with os.scandir(pattern) as entries:
+            for entry in entries:
+                if entry.name.lower().endswith('.pdf') and entry.is_file():
+                    yield entry.path
+    elif pattern.lower().endswith('.pdf'):
+        # A pattern ending in .pdf can only match PDF names, so skip the filter
+        yield from glob.iglob(pattern)
+    else:
+        for path in glob.iglob(pattern):
+            if path.lower().endswith('.pdf'):
+                yield path
+
+
+def collect_input_files(patterns: List[str]) -> List[str]:
+    """
+    Expand input patterns into a list of PDF files.
+    
+    Directories are expanded to the PDF files they contain. Files matched by
+    more than one pattern are only listed once.
+    
+    Args:
+        patterns (List[str]): File paths, directories or glob patterns
+        
+    Returns:
+        List[str]: Matching PDF files, in the order they were found
+    """
+    input_files = []
+    seen = set()
+    
+    for pattern in patterns:
+        for path in _iter_pdfs(pattern):
+            if path not in seen:
+                seen.add(path)
+                input_files.append(path)
+                
+    return input_files
+
+
+def _convert_one(input_path: str, args: argparse.Namespace, formats: List[str],
+                 extract_workers: Optional[int] = None) -> bool:
+    """
+    Convert one PDF file to each requested format.
+    
+    This runs in a worker process during parallel batch conversion, so it
+    handles and logs its own errors.
+    
+    Args:
+        input_path (str): Path to the input PDF file
+        args (argparse.Namespace): Parsed batch arguments
+        formats (List[str]): Output formats to convert to
+        extract_workers (Optional[int]): Worker processes for text extraction
+        
+    Returns:
+        bool: True if the file was processed, False if it could not be opened
+    """
+    try:
+        # Get base filename without extension
+        base_filename = os.path.splitext(os.path.basename(input_path))[0]
+        
+        logger.info("Converting %s", input_path)
+        
+        # Prepare conversion options
+        options = {
+            'include_tables': True,
+            'detect_columns': args.detect_columns,
+            'include_images': args.include_images
+        }
+        
+        # Handle chapter pattern options
+        if args.chapter_pattern:
+            options['chapter_pattern'] = args.chapter_pattern
+            logger.info("Using predefined chapter pattern: %s", args.chapter_pattern)
+        
+        # Handle chapter style
+        if args.chapter_style:
+            options['chapter_style_name'] = args.chapter_style
+            logger.info("Using chapter style: %s", args.chapter_style)
+        
+        # Initialize the converter; it is shared by every requested format,
+        # so the PDF is parsed and its text extracted only once
+        with PDFConverter(input_path, password=args.password, workers=extract_workers) as converter:
+            # Convert to each requested format
+            for fmt in formats:
+                output_path = os.path.join(args.output_dir, f"{base_filename}.{fmt}")
+                
+                try:
+                    converter.convert(fmt, output_path, **options)
+                        
+                    logger.info("Successfully converted to %s", output_path)
+                    
+                except Exception as format_error:
+                    logger.error("Error converting %s to %s: %s", input_path, fmt, format_error)
+                
+        return True
+        
+    except Exception as file_error:
+        logger.error("Error processing %s: %s", input_path, file_error)
+        if args.verbose:
+            import traceback
+            traceback.print_exc()
+        return False
+
+
 def batch_convert_files(args: argparse.Namespace) -> int:
     """
     Convert multiple PDF files.
@@ -344,87 +457,53 @@ def batch_convert_files(args: argparse.Namespace) -> int:
         formats = [fmt.strip().lower() for fmt in args.format.split(',')]
         for fmt in formats:
             if fmt not in ('epub', 'docx', 'html', 'txt', 'md', 'mobi'):
-                logger.error(f"Unsupported format: {fmt}")
+                logger.error("Unsupported format: %s", fmt)
                 return 1
                 
         # Collect input files
-        input_files = []
-        for input_pattern in args.inputs:
-            matched_files = glob.glob(input_pattern)
-            input_files.extend([f for f in matched_files if f.lower().endswith('.pdf')])
+        input_files = collect_input_files(args.inputs)
             
         if not input_files:
             logger.error("No PDF files found matching the input pattern(s)")
             return 1
             
         # Convert each file
-        logger.info(f"Found {len(input_files)} PDF files to convert")
+        logger.info("Found %s PDF files to convert", len(input_files))
+        
+        jobs = min(args.jobs or os.cpu_count() or 1, len(input_files))
         
         success_count = 0
-        for input_path in input_files:
-            try:
-                # Get base filename without extension
-                base_filename = os.path.splitext(os.path.basename(input_path))[0]
-                
-                logger.info(f"Converting {input_path}")
-                
-                # Initialize the converter
-                converter = PDFConverter(input_path, password=args.password)
-                
-                # Prepare conversion options
-                options = {
-                    'include_tables': True,
-                    'detect_columns': args.detect_columns,
-                    'include_images': args.include_images
+        if jobs > 1:
+            # Files share no state, so convert them in separate processes. Page
+            # extraction stays serial inside each worker to avoid oversubscribing.
+            # Start the largest files first so a big book doesn't finish last on its own.
+            input_files.sort(key=os.path.getsize, reverse=True)
+            
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                futures = {
+                    executor.submit(_convert_one, input_path, args, formats, 1): input_path
+                    for input_path in input_files
                 }
-                
-                # Handle chapter pattern options
-                if args.chapter_pattern:
-                    options['chapter_pattern'] = args.chapter_pattern
-                    logger.info(f"Using predefined chapter pattern: {args.chapter_pattern}")
-                
-                # Handle chapter style
-                if args.chapter_style:
-                    options['chapter_style_name'] = args.chapter_style
-                    logger.info(f"Using chapter style: {args.chapter_style}")
-                
-                # Convert to each requested format
-                for fmt in formats:
-                    output_path = os.path.join(args.output_dir, f"{base_filename}.{fmt}")
-                    
+                for future in as_completed(futures):
+                    # A crashed worker fails only its own file, as in the serial branch
                     try:
-                        if fmt == 'epub':
-                            converter.to_epub(output_path, **options)
-                        elif fmt == 'docx':
-                            converter.to_docx(output_path, **options)
-                        elif fmt == 'html':
-                            converter.to_html(output_path, **options)
-                        elif fmt == 'txt':
-                            converter.to_text(output_path, **options)
-                        elif fmt == 'md':
-                            converter.to_markdown(output_path, **options)
-                        elif fmt == 'mobi':
-                            converter.to_mobi(output_path, **options)
-                            
-                        logger.info(f"Successfully converted to {output_path}")
-                        
-                    except Exception as format_error:
-                        logger.error(f"Error converting {input_path} to {fmt}: {format_error}")
-                        
-                success_count += 1
-                
-            except Exception as file_error:
-                logger.error(f"Error processing {input_path}: {file_error}")
-                if args.verbose:
-                    import traceback
-                    traceback.print_exc()
+                        converted = future.result()
+                    except Exception as worker_error:
+                        logger.error("Error processing %s: %s", futures[future], worker_error)
+                        converted = False
+                    if converted:
+                        success_count += 1
+        else:
+            for input_path in input_files:
+                if _convert_one(input_path, args, formats, default_workers()):
+                    success_count += 1
                     
-        logger.info(f"Successfully converted {success_count} out of {len(input_files)} files")
+        logger.info("Successfully converted %s out of %s files", success_count, len(input_files))
         
         return 0 if success_count > 0 else 1
         
     except Exception as e:
-        logger.error(f"Error during batch conversion: {e}")
+        logger.error("Error during batch conversion: %s", e)
         if args.verbose:
             import traceback
             traceback.print_exc()
@@ -449,11 +528,11 @@ def main(args: Optional[List[str]] = None) -> int:
         elif parsed_args.command == 'batch':
             return batch_convert_files(parsed_args)
         else:
-            logger.error(f"Unknown command: {parsed_args.command}")
+            logger.error("Unknown command: %s", parsed_args.command)
             return 1
             
     except Exception as e:
-        logger.error(f"Unhandled error: {e}")
+        logger.error("Unhandled error: %s", e)
         return 1
 
 
@@ -2,12 +2,17 @@
 Core PDF converter class for the book-converter package.
 """
 import os
+import json
+import hashlib
 import logging
-from typing import Dict, Any, List, Optional, Tuple, Union
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Dict, Any, Iterator, List, Optional, Tuple, Union
 from pathlib import Path
 
 import fitz  # PyMuPDF
 
+from . import __version__
 from .formats import (
     EPUBConverter,
     DOCXConverter,
@@ -16,11 +21,62 @@ from .formats import (
     MarkdownConverter,
     MOBIConverter,
 )
-from .utils import extract_images, get_toc, normalize_text, detect_columns
+from .utils import extract_images, iter_images, get_toc, normalize_pages, detect_columns
 
 # Configure logger
 logger = logging.getLogger(__name__)
 
+# Format converter for each supported output format name or extension
+_FORMAT_CONVERTERS = {
+    'epub': EPUBConverter,
+    'docx': DOCXConverter,
+    'html': HTMLConverter,
+    'txt': TextConverter,
+    'text': TextConverter,
+    'md': MarkdownConverter,
+    'markdown': MarkdownConverter,
+    'mobi': MOBIConverter,
+}
+
+# PDF metadata fields copied into PDFConverter.metadata
+_METADATA_FIELDS = ("title", "author", "subject", "keywords", "creator", "producer")
+
+# Documents with fewer pages than this are extracted serially, since the
+# cost of starting worker processes would outweigh the parallel speedup
+_PARALLEL_MIN_PAGES = 8
+
+# Number of pages normalized together during serial extraction
+_NORMALIZE_BLOCK_PAGES = 16
+
+# Multiplier separating 20pt row bands in the block sort key; it only needs
+# to exceed any x coordinate on a page
+_ROW_STRIDE = 1e6
+
+# Bytes read at a time when fingerprinting the PDF for the on-disk text cache
+_HASH_CHUNK_SIZE = 1 << 20
+
+# Part of every on-disk text cache key, together with the package version;
+# bump it whenever extraction or normalize_text output changes, so text
+# cached by an older release is not served stale
+_TEXT_CACHE_VERSION = 2
+
+# Document handle owned by each parallel extraction worker process
+_worker_doc = None
+
+
+def _init_extract_worker(pdf_path: str, password: Optional[str]) -> None:
+    """Open the worker process's own handle on the PDF."""
+    global _worker_doc
+    _worker_doc = fitz.open(pdf_path)
+    if password:
+        _worker_doc.authenticate(password)
+
+
+def _extract_worker_block(page_range: range, detect_columns: bool, preserve_style: bool) -> List[str]:
+    """Extract and normalize a block of consecutive pages inside a worker process."""
+    raw_texts = [PDFConverter._page_text(_worker_doc[n], detect_columns) for n in page_range]
+    return normalize_pages(raw_texts, preserve_style=preserve_style)
+
 
 class PDFConverter:
     """
@@ -30,18 +86,25 @@ class PDFConverter:
         pdf_path (str): Path to the input PDF file
         doc (fitz.Document): PyMuPDF document object
         metadata (Dict[str, str]): Extracted metadata from the PDF
-        pages (List[fitz.Page]): List of PDF pages
-        images (List[Dict]): List of extracted images
+        pages (fitz.Document): Sequence of PDF pages, loaded on access
+        images (List[Dict]): List of extracted images, extracted on first access
         toc (List[Tuple]): Table of contents extracted from the PDF
     """
 
-    def __init__(self, pdf_path: str, password: Optional[str] = None):
+    def __init__(self, pdf_path: str, password: Optional[str] = None, workers: Optional[int] = None,
+                 cache_dir: Optional[str] = None):
         """
         Initialize the PDFConverter with a PDF file.
         
         Args:
             pdf_path (str): Path to the input PDF file
             password (Optional[str]): Password for encrypted PDFs
+            workers (Optional[int]): Default number of worker processes for text
+                extraction. Extraction is serial unless this is above 1, since worker
+                processes re-import the caller's __main__ module under the spawn and
+                forkserver start methods. utils.default_workers suggests a value.
+            cache_dir (Optional[str]): Directory for caching extracted text between runs,
+                keyed by a hash of the PDF contents and the package version. Disabled when not set.
         
         Raises:
             FileNotFoundError: If the PDF file doesn't exist
@@ -51,6 +114,12 @@ class PDFConverter:
             raise FileNotFoundError(f"PDF file not found: {pdf_path}")
         
         self.pdf_path = pdf_path
+        self._password = password
+        self.workers = workers
+        self._images = None
+        self._text_cache = {}
+        self.cache_dir = cache_dir
+        self._fingerprint = None
         
         try:
             self.doc = fitz.open(pdf_path)
@@ -63,18 +132,49 @@ class PDFConverter:
                 
             # Extract basic metadata
             self.metadata = self._extract_metadata()
-            self.pages = [page for page in self.doc]
-            self.images = extract_images(self.doc)
             self.toc = get_toc(self.doc)
             
-            logger.info(f"Successfully loaded PDF: {pdf_path}")
-            logger.info(f"Pages: {len(self.pages)}")
-            logger.info(f"Images: {len(self.images)}")
+            logger.info("Successfully loaded PDF: %s", pdf_path)
+            logger.info("Pages: %s", len(self.pages))
             
         except Exception as e:
-            logger.error(f"Error opening PDF: {e}")
+            logger.error("Error opening PDF: %s", e)
+            self.close()
             raise ValueError(f"Could not open PDF file: {e}")
     
+    @property
+    def pages(self) -> 'fitz.Document':
+        """
+        Pages of the PDF.
+        
+        The document itself supports len(), indexing and iteration, and loads
+        each page only when it is accessed.
+        """
+        return self.doc
+    
+    @property
+    def images(self) -> List[Dict]:
+        """Images extracted from the PDF, extracted on first access."""
+        if self._images is None:
+            self._images = extract_images(self.doc)
+            logger.info("Images: %s", len(self._images))
+        return self._images
+    
+    def iter_images(self) -> Iterator[Dict]:
+        """
+        Iterate over the images in the PDF, extracting each one as it is needed.
+        
+        Unlike the images property, this does not keep the images, so callers
+        that write each image out hold only one at a time. Images already
+        extracted through the images property are reused.
+        
+        Returns:
+            Iterator[Dict]: Image data dictionaries, in page order
+        """
+        if self._images is not None:
+            return iter(self._images)
+        return iter_images(self.doc)
+    
     def _extract_metadata(self) -> Dict[str, str]:
         """
         Extract metadata from the PDF file.
@@ -82,46 +182,216 @@ class PDFConverter:
         Returns:
             Dict[str, str]: Dictionary of metadata
         """
-        metadata = {
-            "title": self.doc.metadata.get("title", ""),
-            "author": self.doc.metadata.get("author", ""),
-            "subject": self.doc.metadata.get("subject", ""),
-            "keywords": self.doc.metadata.get("keywords", ""),
-            "creator": self.doc.metadata.get("creator", ""),
-            "producer": self.doc.metadata.get("producer", ""),
-            "page_count": len(self.doc),
-        }
-        
-        # Clean up empty metadata fields
-        return {k: v for k, v in metadata.items() if v}
+        source = self.doc.metadata
+        
+        # Copy only the non-empty fields
+        metadata = {key: source[key] for key in _METADATA_FIELDS if source.get(key)}
+        
+        page_count = len(self.doc)
+        if page_count:
+            metadata["page_count"] = page_count
+            
+        return metadata
     
-    def extract_text(self, include_tables: bool = True, detect_columns: bool = True, preserve_style: bool = True) -> List[str]:
+    def extract_text(self, include_tables: bool = True, detect_columns: bool = True, preserve_style: bool = True,
+                     workers: Optional[int] = None) -> List[str]:
         """
         Extract text content from each page of the PDF.
         
         Args:
             include_tables (bool): Whether to extract tables as structured text
             detect_columns (bool): Whether to try to detect and handle columns
+            preserve_style (bool): Whether to preserve stylistic whitespace and line breaks
+            workers (Optional[int]): Number of worker processes, defaults to the converter's
+                workers setting. Small documents and workers <= 1 are extracted serially.
             
         Returns:
             List[str]: List of text content for each page
         """
-        text_by_page = []
+        # Every format converter extracts text, so keep the result for the
+        # next conversion of this PDF with the same options
+        key = (detect_columns, preserve_style)
+        if key not in self._text_cache:
+            pages = self._load_cached_text(key)
+            if pages is None:
+                pages = list(self.iter_text(include_tables, detect_columns, preserve_style, workers))
+                self._save_cached_text(key, pages)
+            self._text_cache[key] = pages
+        return list(self._text_cache[key])
+    
+    def _cache_file(self, key: Tuple[bool, bool]) -> str:
+        """
+        Path of the on-disk text cache file for the given extraction options.
+        
+        Args:
+            key (Tuple[bool, bool]): The (detect_columns, preserve_style) options
+            
+        Returns:
+            str: Path of the cache file
+        """
+        if self._fingerprint is None:
+            digest = hashlib.blake2b(digest_size=16)
+            with open(self.pdf_path, 'rb') as f:
+                for chunk in iter(partial(f.read, _HASH_CHUNK_SIZE), b''):
+                    digest.update(chunk)
+            self._fingerprint = digest.hexdigest()
+        
+        detect_columns, preserve_style = key
+        return os.path.join(
+            self.cache_dir,
+            f"{self._fingerprint}_{__version__}.{_TEXT_CACHE_VERSION}_{int(detect_columns)}{int(preserve_style)}.json"
+        )
+    
+    def _load_cached_text(self, key: Tuple[bool, bool]) -> Optional[List[str]]:
+        """
+        Load page text from the on-disk cache, if enabled and present.
+        
+        Args:
+            key (Tuple[bool, bool]): The (detect_columns, preserve_style) options
+            
+        Returns:
+            Optional[List[str]]: Cached text of each page, or None on a miss
+        """
+        if not self.cache_dir:
+            return None
+        
+        try:
+            with open(self._cache_file(key), 'r', encoding='utf-8') as f:
+                pages = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning("Could not read text cache: %s", e)
+            return None
+        
+        if len(pages) != len(self.pages):
+            return None
+        logger.info("Loaded extracted text from cache")
+        return pages
+    
+    def _save_cached_text(self, key: Tuple[bool, bool], pages: List[str]) -> None:
+        """
+        Store page text in the on-disk cache, if enabled.
+        
+        Args:
+            key (Tuple[bool, bool]): The (detect_columns, preserve_style) options
+            pages (List[str]): Text of each page
+        """
+        if not self.cache_dir:
+            return
+        
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            cache_file = self._cache_file(key)
+            # Write to a temporary file first so a concurrent reader never sees a partial cache
+            tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+            try:
+                with open(tmp_file, 'w', encoding='utf-8') as f:
+                    json.dump(pages, f)
+                os.replace(tmp_file, cache_file)
+            finally:
+                # Don't leave a partial temporary file behind if the write failed
+                if os.path.exists(tmp_file):
+                    os.unlink(tmp_file)
+        except OSError as e:
+            logger.warning("Could not write text cache: %s", e)
+    
+    def iter_text(self, include_tables: bool = True, detect_columns: bool = True, preserve_style: bool = True,
+                  workers: Optional[int] = None) -> Iterator[str]:
+        """
+        Extract text content page by page, yielding each page as it is ready.
+        
+        Unlike extract_text, this never holds the text of the whole document,
+        so callers can write pages out as they arrive. Text already cached by
+        extract_text for the same options is reused.
+        
+        Args:
+            include_tables (bool): Whether to extract tables as structured text
+            detect_columns (bool): Whether to try to detect and handle columns
+            preserve_style (bool): Whether to preserve stylistic whitespace and line breaks
+            workers (Optional[int]): Number of worker processes, defaults to the converter's
+                workers setting. Small documents and workers <= 1 are extracted serially.
+            
+        Yields:
+            str: Text content of each page, in page order
+        """
+        cached = self._text_cache.get((detect_columns, preserve_style))
+        if cached is not None:
+            yield from cached
+            return
+        
+        if workers is None:
+            workers = self.workers or 1
+        
+        page_count = len(self.pages)
+        done = 0
+        
+        if workers > 1 and page_count >= _PARALLEL_MIN_PAGES:
+            try:
+                for text in self._iter_text_parallel(min(workers, page_count), detect_columns, preserve_style):
+                    yield text
+                    done += 1
+                return
+            except Exception as e:
+                logger.warning("Parallel text extraction failed, falling back to serial: %s", e)
+        
+        # Serial extraction, resuming after any pages the pool already produced.
+        # Pages are normalized in blocks to cut per-call regex overhead.
+        for block_start in range(done, page_count, _NORMALIZE_BLOCK_PAGES):
+            block_end = min(block_start + _NORMALIZE_BLOCK_PAGES, page_count)
+            raw_texts = [self._page_text(self.pages[n], detect_columns) for n in range(block_start, block_end)]
+            yield from normalize_pages(raw_texts, preserve_style=preserve_style)
     
-        for page_num, page in enumerate(self.pages):
-            if detect_columns:
-                text = self._extract_columns(page)
-            else:
-                # Use raw text extraction to preserve more formatting details
-                text = page.get_text()
+    def _iter_text_parallel(self, workers: int, detect_columns: bool, preserve_style: bool) -> Iterator[str]:
+        """
+        Extract text from all pages using a pool of worker processes.
+        
+        PyMuPDF objects cannot be shared between threads, so each worker process
+        opens its own handle on the PDF once and extracts pages from it. Pages
+        are handed out in blocks, about four per worker, so that pickling and
+        normalization are paid per block rather than per page.
+        
+        Args:
+            workers (int): Number of worker processes
+            detect_columns (bool): Whether to try to detect and handle columns
+            preserve_style (bool): Whether to preserve stylistic whitespace and line breaks
             
-            # Use the enhanced normalization with style preservation
-            text = normalize_text(text, preserve_style=preserve_style)
-            text_by_page.append(text)
+        Yields:
+            str: Text content of each page, in page order
+        """
+        extract = partial(_extract_worker_block, detect_columns=detect_columns, preserve_style=preserve_style)
+        
+        page_count = len(self.pages)
+        block_size = min(-(-page_count // (workers * 4)), _NORMALIZE_BLOCK_PAGES)
+        blocks = [range(start, min(start + block_size, page_count)) for start in range(0, page_count, block_size)]
+        
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_extract_worker,
+            initargs=(self.pdf_path, self._password)
+        ) as executor:
+            for texts in executor.map(extract, blocks):
+                yield from texts
+    
+    @staticmethod
+    def _page_text(page: 'fitz.Page', detect_columns: bool) -> str:
+        """
+        Extract the raw, unnormalized text of a single page.
+        
+        Args:
+            page (fitz.Page): PDF page object
+            detect_columns (bool): Whether to try to detect and handle columns
             
-        return text_by_page
+        Returns:
+            str: Raw page text
+        """
+        if detect_columns:
+            return PDFConverter._extract_columns(page)
+        # Use raw text extraction to preserve more formatting details
+        return page.get_text()
     
-    def _extract_columns(self, page: 'fitz.Page') -> str:
+    @staticmethod
+    def _extract_columns(page: 'fitz.Page') -> str:
         """
         Extract text from a page with column detection.
         
@@ -135,8 +405,34 @@ class PDFConverter:
         # and reconstruct the proper reading order.
         # For now, we use a simplified approach
         blocks = page.get_text("blocks")
-        blocks.sort(key=lambda b: (int(b[1] / 20), b[0]))  # Sort by y then x
-        return "\n".join(b[4] for b in blocks)
+        # Nothing to reorder on blank or single-block pages
+        if len(blocks) < 2:
+            return blocks[0][4] if blocks else ""
+        
+        # Sort by y band then x, packed into one float so no tuple is built per block
+        blocks.sort(key=lambda b: int(b[1] / 20) * _ROW_STRIDE + b[0])
+        return "\n".join([b[4] for b in blocks])
+    
+    def convert(self, fmt: str, output_path: str, **kwargs) -> str:
+        """
+        Convert the PDF to the given format.
+        
+        Args:
+            fmt (str): Output format name or extension ('epub', 'docx', 'html',
+                'txt'/'text', 'md'/'markdown' or 'mobi')
+            output_path (str): Path to save the output file
+            **kwargs: Additional options for the format converter
+            
+        Returns:
+            str: Path to the output file
+            
+        Raises:
+            ValueError: If the format is unsupported or conversion fails
+        """
+        converter_class = _FORMAT_CONVERTERS.get(fmt)
+        if converter_class is None:
+            raise ValueError(f"Unsupported format: {fmt}")
+        return converter_class(self).convert(output_path, **kwargs)
     
     def to_epub(self, output_path: str, **kwargs) -> str:
         """
@@ -152,8 +448,7 @@ class PDFConverter:
         Raises:
             ValueError: If conversion fails
         """
-        converter = EPUBConverter(self)
-        return converter.convert(output_path, **kwargs)
+        return self.convert('epub', output_path, **kwargs)
     
     def to_docx(self, output_path: str, **kwargs) -> str:
         """
@@ -169,8 +464,7 @@ class PDFConverter:
         Raises:
             ValueError: If conversion fails
         """
-        converter = DOCXConverter(self)
-        return converter.convert(output_path, **kwargs)
+        return self.convert('docx', output_path, **kwargs)
     
     def to_html(self, output_path: str, **kwargs) -> str:
         """
@@ -186,8 +480,7 @@ class PDFConverter:
         Raises:
             ValueError: If conversion fails
         """
-        converter = HTMLConverter(self)
-        return converter.convert(output_path, **kwargs)
+        return self.convert('html', output_path, **kwargs)
     
     def to_text(self, output_path: str, **kwargs) -> str:
         """
@@ -203,8 +496,7 @@ class PDFConverter:
         Raises:
             ValueError: If conversion fails
         """
-        converter = TextConverter(self)
-        return converter.convert(output_path, **kwargs)
+        return self.convert('text', output_path, **kwargs)
     
     def to_markdown(self, output_path: str, **kwargs) -> str:
         """
@@ -220,8 +512,7 @@ class PDFConverter:
         Raises:
             ValueError: If conversion fails
         """
-        converter = MarkdownConverter(self)
-        return converter.convert(output_path, **kwargs)
+        return self.convert('markdown', output_path, **kwargs)
     
     def to_mobi(self, output_path: str, **kwargs) -> str:
         """
@@ -237,8 +528,7 @@ class PDFConverter:
         Raises:
             ValueError: If conversion fails
         """
-        converter = MOBIConverter(self)
-        return converter.convert(output_path, **kwargs)
+        return self.convert('mobi', output_path, **kwargs)
     
     def batch_convert(self, output_dir: str, formats: List[str], **kwargs) -> Dict[str, str]:
         """
@@ -267,32 +557,24 @@ class PDFConverter:
             output_path = os.path.join(output_dir, f"{base_filename}.{fmt}")
             
             try:
-                if fmt == 'epub':
-                    output_paths[fmt] = self.to_epub(output_path, **kwargs)
-                elif fmt == 'docx':
-                    output_paths[fmt] = self.to_docx(output_path, **kwargs)
-                elif fmt == 'html':
-                    output_paths[fmt] = self.to_html(output_path, **kwargs)
-                elif fmt == 'txt':
-                    output_paths[fmt] = self.to_text(output_path, **kwargs)
-                elif fmt == 'md':
-                    output_paths[fmt] = self.to_markdown(output_path, **kwargs)
-                elif fmt == 'mobi':
-                    output_paths[fmt] = self.to_mobi(output_path, **kwargs)
-                else:
-                    raise ValueError(f"Unsupported format: {fmt}")
+                output_paths[fmt] = self.convert(fmt, output_path, **kwargs)
                     
-                logger.info(f"Successfully converted to {fmt}: {output_path}")
+                logger.info("Successfully converted to %s: %s", fmt, output_path)
                 
             except Exception as e:
-                logger.error(f"Error converting to {fmt}: {e}")
+                logger.error("Error converting to %s: %s", fmt, e)
                 
         return output_paths
     
-    def __del__(self):
-        """Close the PDF document when the converter is garbage collected."""
-        if hasattr(self, 'doc') and self.doc:
-            try:
-                self.doc.close()
-            except:
-                pass
+    def close(self) -> None:
+        """Close the PDF document. Calling this more than once is harmless."""
+        doc = getattr(self, 'doc', None)
+        if doc is not None:
+            doc.close()
+            self.doc = None
+    
+    def __enter__(self) -> 'PDFConverter':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
@@ -4,14 +4,22 @@ Format-specific converters for transforming PDF content to various file formats.
 import os
 import logging
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional, Tuple, TYPE_CHECKING
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple, TYPE_CHECKING
 from pathlib import Path
 import tempfile
 import shutil
 import re
 import subprocess
+import binascii
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache, partial
+from html import escape
+from io import BytesIO
+from itertools import chain
 
 from .chapter_patterns import ChapterDetector, CHAPTER_PATTERNS, CHAPTER_STYLES
+from .utils import default_workers
 
 # This prevents circular imports
 if TYPE_CHECKING:
@@ -31,6 +39,456 @@ from PIL import Image
 # Configure logger
 logger = logging.getLogger(__name__)
 
+# Page cleaning patterns used by EPUBConverter
+_REGEX_METACHARS_RE = re.compile(r'[.^$*+?{}\[\]\\|()]')
+_TRAILING_DIGITS_RE = re.compile(r'\d+$')
+
+# Default stylesheets for EPUB and HTML output
+_DEFAULT_EPUB_CSS = '''
+/* Chapter opening styles */
+.chapter-opening {
+    margin: 2em 0;
+    font-style: italic;
+    text-align: center;
+    line-height: 1.6;
+}
+
+/* Base Typography */
+body {
+    font-family: 'Palatino', 'Palatino Linotype', 'Book Antiqua', serif;
+    font-size: 1em;
+    line-height: 1.6;
+    margin: 5% 6%;
+    text-align: justify;
+    color: #333;
+    max-width: 40em;
+    hyphens: auto;
+}
+
+/* Headings */
+h1, h2, h3, h4, h5, h6 {
+    font-family: 'Helvetica Neue', 'Arial', sans-serif;
+    line-height: 1.2;
+    margin-top: 2.5em;
+    margin-bottom: 1em;
+    color: #222;
+    font-weight: 600;
+    page-break-after: avoid;
+}
+h1 {
+    font-size: 1.6em;
+    text-align: center;
+    margin-top: 3em;
+    border-bottom: 1px solid #ddd;
+    padding-bottom: 0.5em;
+}
+h2 { font-size: 1.4em; }
+h3 { font-size: 1.2em; }
+h4, h5, h6 { font-size: 1em; }
+
+/* Paragraphs */
+p {
+    margin-top: 0.75em;
+    margin-bottom: 0.75em;
+    orphans: 2;
+    widows: 2;
+}
+
+/* Links */
+a {
+    color: #0066cc;
+    text-decoration: none;
+}
+
+/* Lists */
+ul, ol {
+    margin: 1em 0 1em 1em;
+    padding-left: 1em;
+}
+li {
+    margin-bottom: 0.5em;
+}
+
+/* Images */
+img {
+    max-width: 100%;
+    height: auto;
+    display: block;
+    margin: 1.5em auto;
+    page-break-inside: avoid;
+}
+figure {
+    margin: 1.5em 0;
+    text-align: center;
+}
+figcaption {
+    font-size: 0.9em;
+    font-style: italic;
+    margin-top: 0.5em;
+    color: #555;
+}
+
+/* Blockquotes */
+blockquote {
+    margin: 1.5em 2em;
+    padding-left: 1em;
+    border-left: 3px solid #ddd;
+    font-style: italic;
+    color: #555;
+}
+
+/* Tables */
+table {
+    width: 100%;
+    margin: 1.5em 0;
+    border-collapse: collapse;
+    font-size: 0.9em;
+}
+th, td {
+    padding: 0.5em;
+    border: 1px solid #ddd;
+}
+th {
+    background-color: #f8f8f8;
+    font-weight: bold;
+}
+
+/* Code and Pre */
+code, pre {
+    font-family: "Courier New", Courier, monospace;
+    font-size: 0.9em;
+    white-space: pre-wrap;
+    background-color: #f8f8f8;
+    padding: 0.2em 0.4em;
+    border-radius: 3px;
+}
+pre {
+    margin: 1em 0;
+    padding: 1em;
+    overflow-x: auto;
+    border: 1px solid #ddd;
+    line-height: 1.4;
+}
+pre code {
+    padding: 0;
+    background: none;
+}
+
+/* Horizontal Rule */
+hr {
+    height: 1px;
+    border: 0;
+    background-color: #ddd;
+    margin: 2em 0;
+}
+
+/* Special Elements */
+.footnote {
+    font-size: 0.9em;
+    color: #666;
+    vertical-align: super;
+    line-height: 0;
+}
+.caption {
+    font-size: 0.9em;
+    font-style: italic;
+    text-align: center;
+    color: #555;
+}
+.page-break {
+    page-break-before: always;
+}
+'''
+
+_DEFAULT_HTML_CSS = '''
+body {
+    font-family: serif;
+    line-height: 1.5;
+    margin: 2em auto;
+    max-width: 800px;
+    padding: 0 1em;
+}
+h1, h2, h3, h4, h5, h6 {
+    font-family: sans-serif;
+    margin-top: 1.5em;
+    margin-bottom: 0.5em;
+}
+img {
+    max-width: 100%;
+    height: auto;
+    display: block;
+    margin: 1em auto;
+}
+.page-break {
+    page-break-after: always;
+    margin: 2em 0;
+    border-bottom: 1px dashed #ccc;
+}
+'''
+
+# Cover page shown before the table of contents
+_COVER_PAGE = '''<html xmlns="http://www.w3.org/1999/xhtml" xml:lang="en">
+    <head>
+        <title>Cover</title>
+        <style>
+            body {{
+                margin: 0;
+                padding: 0;
+                text-align: center;
+            }}
+            img {{
+                max-width: 100%;
+                max-height: 100%;
+                margin: 0;
+                padding: 0;
+            }}
+        </style>
+    </head>
+    <body>
+        <div>
+            <img src="{image_name}" alt="Cover Image"/>
+        </div>
+    </body>
+</html>
+'''
+
+# Total characters of page text above which whitespace-collapsing cleanup is
+# spread over worker processes; below this, starting the pool costs more than
+# the cleanup itself
+_PARALLEL_CLEAN_MIN_CHARS = 16_000_000
+
+# Rules used to lay out plain text output
+_TEXT_RULE = "=" * 50
+_TEXT_PAGE_BREAK = "\n\n" + "-" * 50 + "\n\n"
+
+# Threads used to write extracted images to disk
+_IMAGE_WRITE_WORKERS = 4
+
+# Fixed parts of each EPUB chapter document, joined around the title and content
+_CHAPTER_HEAD = '<html>\n<head>\n<title>'
+_CHAPTER_TITLE_END = ('</title>\n<link rel="stylesheet" href="style/default.css" type="text/css" />\n'
+                      '</head>\n<body>\n<h1>')
+_CHAPTER_HEADING_END = '</h1>\n'
+_CHAPTER_TAIL = '\n</body>\n</html>\n'
+
+
+def _build_strip_steps(strip_text: List[str]) -> list:
+    """
+    Prepare ``strip_text`` patterns so each page can be cleaned cheaply.
+    
+    Patterns without regex metacharacters are removed with ``str.replace``,
+    and runs of single-character literals are merged into one ``str.translate``
+    table. Everything else is compiled once. The original order is preserved.
+    
+    Args:
+        strip_text (List[str]): Regex patterns to strip from each page
+        
+    Returns:
+        list: Steps for ``_strip_page`` (translate tables, literals or compiled patterns)
+    """
+    # Steps are deliberately not merged into one alternation (or a trie of
+    # literals): CPython's str.replace beats a single regex scan until there
+    # are dozens of literals, an alternation loses the literal-prefix search
+    # that makes each separate pattern fast, and merging user patterns would
+    # renumber their groups and change overlap and ordering semantics.
+    steps = []
+    for pattern in strip_text:
+        if _REGEX_METACHARS_RE.search(pattern):
+            steps.append(re.compile(pattern))
+        elif len(pattern) == 1:
+            if steps and isinstance(steps[-1], dict):
+                steps[-1][ord(pattern)] = None
+            else:
+                steps.append({ord(pattern): None})
+        else:
+            steps.append(pattern)
+    return steps
+
+
+def _strip_page(page: str, steps: list) -> str:
+    """
+    Remove text from a page using steps built by ``_build_strip_steps``.
+    
+    Args:
+        page (str): Page text
+        steps (list): Prepared strip steps
+        
+    Returns:
+        str: Page text with the matching text removed
+    """
+    for step in steps:
+        if isinstance(step, dict):
+            page = page.translate(step)
+        elif isinstance(step, str):
+            page = page.replace(step, '')
+        else:
+            page = step.sub('', page)
+    return page
+
+
+def _slice_by_toc(text_by_page: List[str], toc: List[Tuple]) -> Iterator[Tuple[int, str, int, str]]:
+    """
+    Split page text into the sections described by a table of contents.
+    
+    Each section runs from its own start page up to, but not including, the
+    start page of the next entry; the last section runs to the end of the book.
+    
+    Args:
+        text_by_page (List[str]): Text of each page
+        toc (List[Tuple]): Table of contents entries as (level, title, page)
+        
+    Yields:
+        Tuple[int, str, int, str]: (level, title, page, content) for each entry
+    """
+    page_count = len(text_by_page)
+    # 0-based start of each entry, followed by the end of the book
+    boundaries = [page - 1 for _, _, page in toc]
+    boundaries.append(page_count)
+    
+    for i, (level, title, page) in enumerate(toc):
+        start_page = boundaries[i]
+        content = "".join(text_by_page[start_page:boundaries[i + 1]]) if start_page < page_count else ""
+        yield level, title, page, content
+
+
+def _write_bytes(path: str, data: bytes) -> None:
+    """Write data to a file, replacing any existing content."""
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+def _save_images(images: Iterable[Dict], images_dir: str) -> List[Tuple[int, str]]:
+    """
+    Save extracted images to a directory next to the output file.
+    
+    The files are written from a small thread pool, since the work is almost
+    entirely disk I/O and releases the GIL. Only a few images wait to be
+    written at any time, so images can be streamed in from PDFConverter.iter_images.
+    
+    Args:
+        images (Iterable[Dict]): Images as returned by PDFConverter.iter_images
+        images_dir (str): Directory to save the images in, created only if there is an image to save
+        
+    Returns:
+        List[Tuple[int, str]]: (index, path relative to the output file) of each saved image, in order
+    """
+    # Loop invariants, hoisted for documents with hundreds of images
+    dir_name = os.path.basename(images_dir)
+    join = os.path.join
+    
+    saved = []
+    pending = deque()
+    
+    with ThreadPoolExecutor(max_workers=_IMAGE_WRITE_WORKERS) as executor:
+        for i, img_data in enumerate(images):
+            if 'image' not in img_data:
+                continue
+            
+            if not saved:
+                os.makedirs(images_dir, exist_ok=True)
+            
+            img_filename = f'image_{i}.{img_data["ext"]}'
+            saved.append((i, f'{dir_name}/{img_filename}'))
+            pending.append(executor.submit(_write_bytes, join(images_dir, img_filename), img_data['image']))
+            
+            # Wait for the oldest write once every thread has work queued,
+            # which bounds the number of images held in memory
+            if len(pending) > 2 * _IMAGE_WRITE_WORKERS:
+                pending.popleft().result()
+        
+        # Collect the remaining results so that any write error is raised here
+        for future in pending:
+            future.result()
+    
+    return saved
+
+
+def _non_empty(items: Iterable) -> Optional[Iterator]:
+    """
+    Return an iterator over items, or None if there are none.
+    
+    At most the first item is taken to find out, and it is put back in front.
+    
+    Args:
+        items (Iterable): Items to check, such as a generator
+        
+    Returns:
+        Optional[Iterator]: Iterator over all the items, or None if there are none
+    """
+    iterator = iter(items)
+    for first in iterator:
+        return chain((first,), iterator)
+    return None
+
+
+@lru_cache(maxsize=1)
+def _calibre_available() -> bool:
+    """
+    Check if Calibre's ebook-convert is available in the system.
+    
+    The result is cached for the life of the process, so a batch of MOBI
+    conversions only looks for the tool once.
+    
+    Returns:
+        bool: True if available, False otherwise
+    """
+    # A PATH lookup is much cheaper than starting a process, and rules out the common case
+    if shutil.which('ebook-convert') is None:
+        return False
+    
+    try:
+        # Try to run ebook-convert with --version
+        result = subprocess.run(
+            ['ebook-convert', '--version'], 
+            stdout=subprocess.PIPE, 
+            stderr=subprocess.PIPE,
+            timeout=5
+        )
+        return result.returncode == 0
+    except (subprocess.SubprocessError, FileNotFoundError):
+        return False
+
+
+def _paragraphs(text: str) -> List[str]:
+    """
+    Split text into stripped, non-empty paragraphs separated by blank lines.
+    
+    Args:
+        text (str): Text to split
+        
+    Returns:
+        List[str]: Paragraphs in order
+    """
+    # str.split and str.strip run in C; each paragraph is stripped only once
+    return [para_text for para_text in map(str.strip, text.split('\n\n')) if para_text]
+
+
+def _clean_page(page: str, preserve_style: bool, strip_steps: list) -> str:
+    """
+    Clean the text of one page for EPUB output.
+    
+    Args:
+        page (str): Page text
+        preserve_style (bool): Whether to keep whitespace and line breaks as they are
+        strip_steps (list): Strip steps built by ``_build_strip_steps``
+        
+    Returns:
+        str: Cleaned page text, HTML-escaped for use in XHTML
+    """
+    # More careful processing to preserve style
+    if preserve_style:
+        # Only minimal necessary processing
+        page = page.replace('\u200b', '\n')  # Handle zero-width spaces
+    else:
+        # Original aggressive processing for non-style-preserving mode
+        # Collapsing whitespace runs via split/join avoids the regex engine;
+        # str.split uses the same definition of whitespace as \s
+        page = ' '.join(page.split())
+        page = page.replace('\u200b', '\n')
+        
+    # Escape the whole page once rather than each paragraph or chapter
+    return escape(_strip_page(page, strip_steps), quote=False)
+
 
 class BaseFormatConverter(ABC):
     """
@@ -80,9 +538,15 @@ class EPUBConverter(BaseFormatConverter):
                 - css (str): Custom CSS
                 - toc_depth (int): Table of contents depth
                 - strip_text (list): Text patterns to strip
-                - chapter_pattern (str): Regex pattern to detect chapter openings
+                - chapter_pattern (str): Regex pattern to detect chapter openings, matched against
+                  HTML-escaped text, so a literal &, < or > is written &amp;, &lt; or &gt;
                 - chapter_style (str): CSS style for chapter openings
                 - chapter_style_name (str): Predefined style name ('standard', 'quoted', 'decorative')
+                - chapter_scan_chars (int): Only look for chapter openings this far into each chapter
+                - parallel (bool): Whether to clean very large books in worker processes,
+                  when the PDFConverter was created with workers above 1
+                - compresslevel (int): Deflate level from 0 to 9 for the EPUB archive (default: 6);
+                  lower levels write faster at the cost of a slightly larger file
                 
         Returns:
             str: Path to the output EPUB file
@@ -96,27 +560,26 @@ class EPUBConverter(BaseFormatConverter):
                 detect_columns=kwargs.get('detect_columns', True)
             )
             
-            text_by_page = []
-            for page in text_by_page_:
-                # More careful processing to preserve style
-                if kwargs.get('preserve_style', True):
-                    # Only minimal necessary processing
-                    page = re.sub(r'\u200b', '\n', page)  # Handle zero-width spaces
-                    
-                    if strip_text:
-                        for pattern in strip_text:
-                            page = re.sub(pattern, '', page)
-                else:
-                    # Original aggressive processing for non-style-preserving mode
-                    page = re.sub(r'\s+', ' ', page)
-                    page = re.sub(r'^\s+|\s+$', '', page)
-                    page = re.sub(r'\u200b', '\n', page)
-                    
-                    if strip_text:
-                        for pattern in strip_text:
-                            page = re.sub(pattern, '', page)
-                        
-                text_by_page.append(page)
+            # Prepare the caller's strip patterns once rather than on every page
+            preserve_style = kwargs.get('preserve_style', True)
+            clean = partial(_clean_page, preserve_style=preserve_style, strip_steps=_build_strip_steps(strip_text))
+            
+            # Follow the converter's workers setting, which is 1 inside batch workers
+            # and unset for serial use, so the pool never oversubscribes the CPUs
+            workers = min(self.pdf_converter.workers or 1, default_workers())
+            text_by_page = None
+            if (kwargs.get('parallel', True) and workers > 1 and not preserve_style
+                    and sum(map(len, text_by_page_)) >= _PARALLEL_CLEAN_MIN_CHARS):
+                try:
+                    with ProcessPoolExecutor(max_workers=workers) as executor:
+                        text_by_page = list(executor.map(
+                            clean, text_by_page_, chunksize=max(1, len(text_by_page_) // (4 * workers))
+                        ))
+                except Exception as e:
+                    logger.warning(f"Parallel page cleaning failed, falling back to serial: {e}")
+            
+            if text_by_page is None:
+                text_by_page = [clean(page) for page in text_by_page_]
                 
             # Create a new EPUB book
             book = epub.EpubBook()
@@ -144,291 +607,34 @@ class EPUBConverter(BaseFormatConverter):
                     logger.warning(f"Failed to initialize chapter detector: {e}")
             
             # Set metadata
-            title = kwargs.get('title') or self.pdf_converter.metadata.get('title', 'Untitled Book')
-            author = kwargs.get('author') or self.pdf_converter.metadata.get('author', 'Unknown Author')
+            metadata = self.pdf_converter.metadata
+            title = kwargs.get('title') or metadata.get('title', 'Untitled Book')
+            author = kwargs.get('author') or metadata.get('author', 'Unknown Author')
             language = kwargs.get('language', 'en')
             
             book.set_title(title)
             book.set_language(language)
             book.add_author(author)
             
+            images = self.pdf_converter.images
+            
             # Add cover if provided
+            has_cover = False
             cover_image_path = kwargs.get('cover_image')
             if cover_image_path and os.path.exists(cover_image_path):
-                with open(cover_image_path, 'rb') as img_file:
-                    cover_content = img_file.read()
-                    # Add the cover image item
-                    cover_image = epub.EpubImage(
-                        uid='cover-image',
-                        file_name='images/cover.jpg',
-                        content=cover_content,
-                        media_type='image/jpeg'
-                    )
-                    book.add_item(cover_image)
-                    
-                    # Set the cover property for the EPUB
-                    book.set_cover('images/cover.jpg', cover_content)
-                    
-                    # Create a properly formatted cover HTML page with styling
-                    cover_html = epub.EpubHtml(
-                        uid='cover',
-                        title='Cover',
-                        file_name='cover.xhtml'
-                    )
-                    cover_html.content = '''
-                    <html xmlns="http://www.w3.org/1999/xhtml" xml:lang="en">
-                        <head>
-                            <title>Cover</title>
-                            <style>
-                                body {
-                                    margin: 0;
-                                    padding: 0;
-                                    text-align: center;
-                                }
-                                img {
-                                    max-width: 100%;
-                                    max-height: 100%;
-                                    margin: 0;
-                                    padding: 0;
-                                }
-                            </style>
-                        </head>
-                        <body>
-                            <div>
-                                <img src="images/cover.jpg" alt="Cover Image"/>
-                            </div>
-                        </body>
-                    </html>
-                    '''
-                    book.add_item(cover_html)
-                    
-                    # Don't set spine yet, we'll include the cover in the final spine
-                    # Just track that we have a cover
-                    has_cover = True
-                    
-                    # Add to guide as cover
-                    book.guide.append({
-                        'type': 'cover',
-                        'href': 'cover.xhtml',
-                        'title': 'Cover'
-                    })
-            elif self.pdf_converter.images and len(self.pdf_converter.images) > 0:
+                cover_ext = os.path.splitext(cover_image_path)[1].lstrip('.').lower() or 'jpg'
+                self._add_cover(book, Path(cover_image_path).read_bytes(), cover_ext)
+                has_cover = True
+            elif images:
                 # Use the first image as cover if available
-                first_image = self.pdf_converter.images[0]
+                first_image = images[0]
                 if 'image' in first_image:
-                    # Similar pattern for extracted image
-                    book.set_cover('images/cover.jpg', first_image['image'])
-                    
-                    cover_image = epub.EpubImage(
-                        uid='cover-image',
-                        file_name='images/cover.jpg',
-                        content=first_image['image'],
-                        media_type=f'image/{first_image["ext"]}'
-                    )
-                    book.add_item(cover_image)
-                    
-                    cover_html = epub.EpubHtml(
-                        uid='cover',
-                        title='Cover',
-                        file_name='cover.xhtml'
-                    )
-                    cover_html.content = '''
-                    <html xmlns="http://www.w3.org/1999/xhtml" xml:lang="en">
-                        <head>
-                            <title>Cover</title>
-                            <style>
-                                body {
-                                    margin: 0;
-                                    padding: 0;
-                                    text-align: center;
-                                }
-                                img {
-                                    max-width: 100%;
-                                    max-height: 100%;
-                                    margin: 0;
-                                    padding: 0;
-                                }
-                            </style>
-                        </head>
-                        <body>
-                            <div>
-                                <img src="images/cover.jpg" alt="Cover Image"/>
-                            </div>
-                        </body>
-                    </html>
-                    '''
-                    book.add_item(cover_html)
-                    
-                    # Don't set spine yet, we'll include the cover in the final spine
-                    # Just track that we have a cover
+                    self._add_cover(book, first_image['image'], first_image['ext'])
                     has_cover = True
-                    
-                    # Add to guide as cover
-                    book.guide.append({
-                        'type': 'cover',
-                        'href': 'cover.xhtml',
-                        'title': 'Cover'
-                    })
                 
             # Create CSS
-            default_css = '''
-            /* Chapter opening styles */
-            .chapter-opening {
-                margin: 2em 0;
-                font-style: italic;
-                text-align: center;
-                line-height: 1.6;
-            }
-            
-            /* Base Typography */
-            body {
-                font-family: 'Palatino', 'Palatino Linotype', 'Book Antiqua', serif;
-                font-size: 1em;
-                line-height: 1.6;
-                margin: 5% 6%;
-                text-align: justify;
-                color: #333;
-                max-width: 40em;
-                hyphens: auto;
-            }
-
-            /* Headings */
-            h1, h2, h3, h4, h5, h6 {
-                font-family: 'Helvetica Neue', 'Arial', sans-serif;
-                line-height: 1.2;
-                margin-top: 2.5em;
-                margin-bottom: 1em;
-                color: #222;
-                font-weight: 600;
-                page-break-after: avoid;
-            }
-            h1 {
-                font-size: 1.6em;
-                text-align: center;
-                margin-top: 3em;
-                border-bottom: 1px solid #ddd;
-                padding-bottom: 0.5em;
-            }
-            h2 { font-size: 1.4em; }
-            h3 { font-size: 1.2em; }
-            h4, h5, h6 { font-size: 1em; }
-
-            /* Paragraphs */
-            p {
-                margin-top: 0.75em;
-                margin-bottom: 0.75em;
-                orphans: 2;
-                widows: 2;
-            }
-
-            /* Links */
-            a {
-                color: #0066cc;
-                text-decoration: none;
-            }
-
-            /* Lists */
-            ul, ol {
-                margin: 1em 0 1em 1em;
-                padding-left: 1em;
-            }
-            li {
-                margin-bottom: 0.5em;
-            }
-
-            /* Images */
-            img {
-                max-width: 100%;
-                height: auto;
-                display: block;
-                margin: 1.5em auto;
-                page-break-inside: avoid;
-            }
-            figure {
-                margin: 1.5em 0;
-                text-align: center;
-            }
-            figcaption {
-                font-size: 0.9em;
-                font-style: italic;
-                margin-top: 0.5em;
-                color: #555;
-            }
-
-            /* Blockquotes */
-            blockquote {
-                margin: 1.5em 2em;
-                padding-left: 1em;
-                border-left: 3px solid #ddd;
-                font-style: italic;
-                color: #555;
-            }
-
-            /* Tables */
-            table {
-                width: 100%;
-                margin: 1.5em 0;
-                border-collapse: collapse;
-                font-size: 0.9em;
-            }
-            th, td {
-                padding: 0.5em;
-                border: 1px solid #ddd;
-            }
-            th {
-                background-color: #f8f8f8;
-                font-weight: bold;
-            }
-
-            /* Code and Pre */
-            code, pre {
-                font-family: "Courier New", Courier, monospace;
-                font-size: 0.9em;
-                white-space: pre-wrap;
-                background-color: #f8f8f8;
-                padding: 0.2em 0.4em;
-                border-radius: 3px;
-            }
-            pre {
-                margin: 1em 0;
-                padding: 1em;
-                overflow-x: auto;
-                border: 1px solid #ddd;
-                line-height: 1.4;
-            }
-            pre code {
-                padding: 0;
-                background: none;
-            }
-
-            /* Horizontal Rule */
-            hr {
-                height: 1px;
-                border: 0;
-                background-color: #ddd;
-                margin: 2em 0;
-            }
-
-            /* Special Elements */
-            .footnote {
-                font-size: 0.9em;
-                color: #666;
-                vertical-align: super;
-                line-height: 0;
-            }
-            .caption {
-                font-size: 0.9em;
-                font-style: italic;
-                text-align: center;
-                color: #555;
-            }
-            .page-break {
-                page-break-before: always;
-            }
-            '''
             # Add chapter style to CSS if provided
-            if chapter_style:
-                default_css += chapter_style
+            default_css = _DEFAULT_EPUB_CSS + chapter_style if chapter_style else _DEFAULT_EPUB_CSS
                 
             css = kwargs.get('css', default_css)
             css_file = epub.EpubItem(
@@ -449,39 +655,32 @@ class EPUBConverter(BaseFormatConverter):
             
             # If we have TOC, use it to structure chapters
             if has_toc:
-                current_page = 0
                 pdf_toc = [
                     (level, title, page) for level, title, page in pdf_toc
                     if title not in (' ', '- ', '\u200b ')
                 ]
-                for i, (level, title, page) in enumerate(pdf_toc):
-                    
-                    # Calculate page range for chapter content
-                    start_page = page-1  # 0-based index
-                    
-                    # If this is the last chapter, get all remaining pages
-                    if i + 1 < len(pdf_toc):
-                        end_page = pdf_toc[i + 1][2] - 1  # Next chapter's start page (0-based)
-                    else:
-                        end_page = len(text_by_page)  # Get all remaining pages
-                    
-                    # Get content for this chapter
-                    chapter_content = ""  # Initialize empty string
-                    if start_page < len(text_by_page):  # Verify start page is valid
-                        chapter_content = "".join(text_by_page[start_page:end_page])
+                # One chapter per TOC entry, so the final size is known up front
+                chapters = [None] * len(pdf_toc)
+                for i, (level, title, page, chapter_content) in enumerate(_slice_by_toc(text_by_page, pdf_toc)):
                     
                     # Apply chapter pattern formatting if detector is available
                     if chapter_detector:
-                        chapter_content = chapter_detector.format_chapter_openings(chapter_content, chapter_title=title)
+                        chapter_content = chapter_detector.format_chapter_openings(
+                            chapter_content, chapter_title=escape(title, quote=False),
+                            max_chars=kwargs.get('chapter_scan_chars')
+                        )
                     
                     # Create chapter
                     chapter = self._create_chapter(f'chapter_{i}', title, chapter_content, css_file)
                     book.add_item(chapter)
-                    chapters.append(chapter)
+                    chapters[i] = chapter
                     
-                    # Add to toc
-                    if level <= kwargs.get('toc_depth', 3):
-                        toc.append((chapter, chapter.file_name))
+                # Add chapters up to the requested depth to the toc
+                toc_depth = kwargs.get('toc_depth', 3)
+                toc = [
+                    (chapter, chapter.file_name)
+                    for (level, _, _), chapter in zip(pdf_toc, chapters) if level <= toc_depth
+                ]
             else:
                 # No TOC, create a chapter per page or group pages
                 page_count = len(text_by_page)
@@ -518,7 +717,7 @@ class EPUBConverter(BaseFormatConverter):
                         toc.append((chapter, chapter.file_name))
             
             # Add images
-            for i, img_data in enumerate(self.pdf_converter.images):
+            for i, img_data in enumerate(images):
                 if 'image' in img_data:
                     img_item = epub.EpubItem(
                         uid=f'image_{i}',
@@ -548,13 +747,13 @@ class EPUBConverter(BaseFormatConverter):
             book.add_item(epub.EpubNav())
             
             # Define spine with cover first if we have one
-            if 'has_cover' in locals() and has_cover:
+            if has_cover:
                 book.spine = ['cover', 'nav'] + chapters
             else:
                 book.spine = ['nav'] + chapters
             
             # Write to file
-            epub.write_epub(output_path, book, {})
+            epub.write_epub(output_path, book, {'compresslevel': kwargs.get('compresslevel', 6)})
             
             logger.info(f"Successfully converted to EPUB: {output_path}")
             return output_path
@@ -563,6 +762,37 @@ class EPUBConverter(BaseFormatConverter):
             logger.error(f"Error converting to EPUB: {e}")
             raise ValueError(f"Failed to convert to EPUB: {e}")
     
+    def _add_cover(self, book: epub.EpubBook, content: bytes, ext: str) -> None:
+        """
+        Add a cover image and a cover page to the book.
+        
+        The image is added once, as the book's cover item, so the EPUB does not
+        carry a second copy of it or of the cover page.
+        
+        Args:
+            book (epub.EpubBook): Book to add the cover to
+            content (bytes): Cover image data
+            ext (str): Image file extension, used to determine its media type
+        """
+        image_name = f'images/cover.{ext}'
+        book.set_cover(image_name, content, create_page=False)
+        
+        # Create a properly formatted cover HTML page with styling
+        cover_html = epub.EpubHtml(
+            uid='cover',
+            title='Cover',
+            file_name='cover.xhtml'
+        )
+        cover_html.content = _COVER_PAGE.format(image_name=image_name)
+        book.add_item(cover_html)
+        
+        # Add to guide as cover
+        book.guide.append({
+            'type': 'cover',
+            'href': 'cover.xhtml',
+            'title': 'Cover'
+        })
+    
     def _create_chapter(self, id_name: str, title: str, content: str, css: epub.EpubItem) -> epub.EpubHtml:
         """
         Create an EPUB chapter.
@@ -581,28 +811,18 @@ class EPUBConverter(BaseFormatConverter):
         title = title.title()
         
         # If the content ends with n number of digits, remove them all
-        if re.search(r'\d+$', content):
-            content = re.sub(r'\d+$', '', content)
-        
-        content = content.strip()
+        content = _TRAILING_DIGITS_RE.sub('', content).strip()
         
         chapter = epub.EpubHtml(
             title=title, 
             file_name=f'{id_name}.xhtml',
             lang='en'
         )
-        chapter.content = f'''
-        <html>
-        <head>
-            <title>{title}</title>
-            <link rel="stylesheet" href="style/default.css" type="text/css" />
-        </head>
-        <body>
-            <h1>{title}</h1>
-            {content}
-        </body>
-        </html>
-        '''
+        escaped_title = escape(title)
+        chapter.content = ''.join((
+            _CHAPTER_HEAD, escaped_title, _CHAPTER_TITLE_END,
+            escaped_title, _CHAPTER_HEADING_END, content, _CHAPTER_TAIL
+        ))
         chapter.add_item(css)
         return chapter
 
@@ -627,21 +847,17 @@ class DOCXConverter(BaseFormatConverter):
             str: Path to the output DOCX file
         """
         try:
-            # Extract text and data from the PDF
-            text_by_page = self.pdf_converter.extract_text(
-                include_tables=kwargs.get('include_tables', True),
-                detect_columns=kwargs.get('detect_columns', True)
-            )
-            
             # Create a new DOCX document
             doc = Document()
             
             # Set metadata
-            title = kwargs.get('title') or self.pdf_converter.metadata.get('title', 'Untitled Document')
+            metadata = self.pdf_converter.metadata
+            title = kwargs.get('title') or metadata.get('title', 'Untitled Document')
+            author = metadata.get('author')
             doc.core_properties.title = title
             
-            if self.pdf_converter.metadata.get('author'):
-                doc.core_properties.author = self.pdf_converter.metadata.get('author')
+            if author:
+                doc.core_properties.author = author
                 
             # Add title page if requested
             if kwargs.get('add_title_page', True):
@@ -652,10 +868,10 @@ class DOCXConverter(BaseFormatConverter):
                 title_run.font.bold = True
                 
                 # Add author if available
-                if self.pdf_converter.metadata.get('author'):
+                if author:
                     author_paragraph = doc.add_paragraph()
                     author_paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                    author_paragraph.add_run(self.pdf_converter.metadata.get('author'))
+                    author_paragraph.add_run(author)
                     
                 doc.add_page_break()
             
@@ -665,64 +881,49 @@ class DOCXConverter(BaseFormatConverter):
             
             # Add content based on TOC or page by page
             if has_toc:
+                # Sections may refer to any page, so extract them all up front
+                text_by_page = self.pdf_converter.extract_text(
+                    include_tables=kwargs.get('include_tables', True),
+                    detect_columns=kwargs.get('detect_columns', True)
+                )
+                
                 # Use TOC to structure the document
-                current_page = 0
-                for i, (level, title, page) in enumerate(pdf_toc):
+                for level, title, page, section_content in _slice_by_toc(text_by_page, pdf_toc):
                     # Add heading with appropriate level
                     heading = doc.add_heading(title, level=min(level, 9))
                     
-                    # Calculate page range for section content
-                    start_page = page-1  # 0-based index
-                    
-                    # If this is the last section, get all remaining pages
-                    if i + 1 < len(pdf_toc):
-                        end_page = pdf_toc[i + 1][2] - 1  # Next section's start page (0-based)
-                    else:
-                        end_page = len(text_by_page)  # Get all remaining pages
-                    
-                    # Get content for this section
-                    section_content = ""  # Initialize empty string
-                    if start_page < len(text_by_page):  # Verify start page is valid
-                        section_content = "".join(text_by_page[start_page:end_page])
-                    
                     # Break into paragraphs and add
-                    paragraphs = section_content.split('\n\n')
-                    for para_text in paragraphs:
-                        if para_text.strip():
-                            doc.add_paragraph(para_text.strip())
+                    for para_text in _paragraphs(section_content):
+                        doc.add_paragraph(para_text)
             else:
-                # No TOC, just add content page by page
-                for i, page_text in enumerate(text_by_page):
+                # No TOC, add content page by page as it is extracted
+                page_count = len(self.pdf_converter.pages)
+                pages = self.pdf_converter.iter_text(
+                    include_tables=kwargs.get('include_tables', True),
+                    detect_columns=kwargs.get('detect_columns', True)
+                )
+                for i, page_text in enumerate(pages):
                     # Break into paragraphs and add
-                    paragraphs = page_text.split('\n\n')
-                    for para_text in paragraphs:
-                        if para_text.strip():
-                            doc.add_paragraph(para_text.strip())
+                    for para_text in _paragraphs(page_text):
+                        doc.add_paragraph(para_text)
                     
                     # Add page break between pages
-                    if i < len(text_by_page) - 1:
+                    if i < page_count - 1:
                         doc.add_page_break()
             
             # Add images if requested
-            if kwargs.get('include_images', True) and self.pdf_converter.images:
+            images = _non_empty(self.pdf_converter.iter_images()) if kwargs.get('include_images', True) else None
+            if images:
                 doc.add_heading('Images', level=1)
                 
-                # Create a temp directory for images
-                with tempfile.TemporaryDirectory() as temp_dir:
-                    for i, img_data in enumerate(self.pdf_converter.images):
-                        if 'image' in img_data:
-                            img_path = os.path.join(temp_dir, f'image_{i}.{img_data["ext"]}')
-                            
-                            # Save image to temp file
-                            with open(img_path, 'wb') as img_file:
-                                img_file.write(img_data['image'])
-                            
-                            # Add to document
-                            try:
-                                doc.add_picture(img_path, width=Inches(6))
-                                doc.add_paragraph(f"Image {i+1}")
-                            except Exception as img_err:
-                                logger.warning(f"Could not add image {i}: {img_err}")
+                for i, img_data in enumerate(images):
+                    if 'image' in img_data:
+                        # Add to document straight from memory
+                        try:
+                            doc.add_picture(BytesIO(img_data['image']), width=Inches(6))
+                            doc.add_paragraph(f"Image {i+1}")
+                        except Exception as img_err:
+                            logger.warning(f"Could not add image {i}: {img_err}")
             
             # Save the document
             doc.save(output_path)
@@ -751,51 +952,26 @@ class HTMLConverter(BaseFormatConverter):
                 - include_images (bool): Whether to include images
                 - css (str): Custom CSS
                 - embed_images (bool): Whether to embed images as base64
+                - pretty (bool): Whether to re-indent the output with BeautifulSoup
+                - detect_columns (bool): Whether to reorder text in multi-column layouts (default True)
                 
         Returns:
             str: Path to the output HTML file
         """
         try:
-            # Extract text and data from the PDF
-            text_by_page = self.pdf_converter.extract_text(
-                include_tables=kwargs.get('include_tables', True),
-                detect_columns=kwargs.get('detect_columns', True)
-            )
-            
             # Set metadata
-            title = kwargs.get('title') or self.pdf_converter.metadata.get('title', 'Untitled Document')
-            author = self.pdf_converter.metadata.get('author', 'Unknown Author')
+            metadata = self.pdf_converter.metadata
+            title = escape(kwargs.get('title') or metadata.get('title', 'Untitled Document'))
+            author = escape(metadata.get('author', 'Unknown Author'))
             
-            # Default CSS
-            default_css = '''
-            body {
-                font-family: serif;
-                line-height: 1.5;
-                margin: 2em auto;
-                max-width: 800px;
-                padding: 0 1em;
-            }
-            h1, h2, h3, h4, h5, h6 {
-                font-family: sans-serif;
-                margin-top: 1.5em;
-                margin-bottom: 0.5em;
-            }
-            img {
-                max-width: 100%;
-                height: auto;
-                display: block;
-                margin: 1em auto;
-            }
-            .page-break {
-                page-break-after: always;
-                margin: 2em 0;
-                border-bottom: 1px dashed #ccc;
-            }
-            '''
-            css = kwargs.get('css', default_css)
+            css = kwargs.get('css', _DEFAULT_HTML_CSS)
+            
+            # Collect fragments in a list and join once at the end
+            parts = []
+            append = parts.append
             
             # Create the base HTML structure
-            html = f'''<!DOCTYPE html>
+            append(f'''<!DOCTYPE html>
             <html lang="en">
             <head>
                 <meta charset="UTF-8">
@@ -811,134 +987,118 @@ class HTMLConverter(BaseFormatConverter):
                     <p>Author: {author}</p>
                 </header>
                 <main>
-            '''
+            ''')
             
             # Process table of contents if available
             pdf_toc = self.pdf_converter.toc
             has_toc = pdf_toc and len(pdf_toc) > 0
             
-            # Create TOC section if TOC exists
+            # Add content based on TOC or page by page
             if has_toc:
-                html += '<nav id="toc"><h2>Table of Contents</h2><ul>'
+                # Sections may refer to any page, so extract them all up front
+                text_by_page = self.pdf_converter.extract_text(
+                    include_tables=kwargs.get('include_tables', True),
+                    detect_columns=kwargs.get('detect_columns', True)
+                )
                 
-                for level, title, page in pdf_toc:
+                # Use TOC to structure the document, building the TOC section
+                # and the content sections in a single walk
+                nav_parts = ['<nav id="toc"><h2>Table of Contents</h2><ul>']
+                section_parts = []
+                for level, title, page, section_content in _slice_by_toc(text_by_page, pdf_toc):
+                    title = escape(title)
+                    
                     # Indentation based on level
                     indent = '    ' * (level - 1)
-                    html += f'{indent}<li><a href="#page_{page}">{title}</a></li>\n'
-                
-                html += '</ul></nav>\n'
-            
-            # Add content based on TOC or page by page
-            if has_toc:
-                # Use TOC to structure the document
-                current_page = 0
-                for i, (level, title, page) in enumerate(pdf_toc):
-                    # Add section heading
-                    html += f'<section id="page_{page}">\n'
-                    html += f'<h{min(level+1, 6)}>{title}</h{min(level+1, 6)}>\n'
-                    
-                    # Calculate page range for section content
-                    start_page = page-1  # 0-based index
-                    
-                    # If this is the last section, get all remaining pages
-                    if i + 1 < len(pdf_toc):
-                        end_page = pdf_toc[i + 1][2] - 1  # Next section's start page (0-based)
-                    else:
-                        end_page = len(text_by_page)  # Get all remaining pages
+                    nav_parts.append(f'{indent}<li><a href="#page_{page}">{title}</a></li>\n')
                     
-                    # Get content for this section
-                    section_content = ""  # Initialize empty string
-                    if start_page < len(text_by_page):  # Verify start page is valid
-                        section_content = "".join(text_by_page[start_page:end_page])
+                    # Add section heading
+                    heading_level = min(level + 1, 6)
+                    section_parts.append(f'<section id="page_{page}">\n<h{heading_level}>{title}</h{heading_level}>\n')
                     
                     # Convert newlines to <p> tags
-                    paragraphs = section_content.split('\n\n')
-                    for para_text in paragraphs:
-                        if para_text.strip():
-                            html += f'<p>{para_text.strip()}</p>\n'
+                    section_parts.extend(
+                        f'<p>{para_text}</p>\n' for para_text in _paragraphs(escape(section_content, quote=False))
+                    )
                     
-                    html += '</section>\n'
+                    section_parts.append('</section>\n')
+                
+                nav_parts.append('</ul></nav>\n')
+                append(''.join(nav_parts))
+                append(''.join(section_parts))
             else:
-                # No TOC, just add content page by page
-                for i, page_text in enumerate(text_by_page):
-                    html += f'<section id="page_{i+1}">\n'
+                # No TOC, add content page by page as it is extracted
+                page_count = len(self.pdf_converter.pages)
+                pages = self.pdf_converter.iter_text(
+                    include_tables=kwargs.get('include_tables', True),
+                    detect_columns=kwargs.get('detect_columns', True)
+                )
+                for i, page_text in enumerate(pages):
+                    append(f'<section id="page_{i+1}">\n')
                     
                     # Convert newlines to <p> tags
-                    paragraphs = page_text.split('\n\n')
-                    for para_text in paragraphs:
-                        if para_text.strip():
-                            html += f'<p>{para_text.strip()}</p>\n'
+                    append(''.join(
+                        f'<p>{para_text}</p>\n' for para_text in _paragraphs(escape(page_text, quote=False))
+                    ))
                             
-                    html += '</section>\n'
+                    append('</section>\n')
                     
                     # Add page break between pages
-                    if i < len(text_by_page) - 1:
-                        html += '<div class="page-break"></div>\n'
+                    if i < page_count - 1:
+                        append('<div class="page-break"></div>\n')
             
             # Handle images
-            if kwargs.get('include_images', True) and self.pdf_converter.images:
+            images = _non_empty(self.pdf_converter.iter_images()) if kwargs.get('include_images', True) else None
+            if images:
                 # Determine if we should embed or save images separately
                 embed_images = kwargs.get('embed_images', False)
                 
                 if embed_images:
                     # Embed images as base64
-                    html += '<section id="images"><h2>Images</h2>\n'
+                    append('<section id="images"><h2>Images</h2>\n')
                     
-                    for i, img_data in enumerate(self.pdf_converter.images):
+                    for i, img_data in enumerate(images):
                         if 'image' in img_data:
-                            import base64
-                            b64_img = base64.b64encode(img_data['image']).decode('utf-8')
-                            mime_type = f"image/{img_data['ext']}"
+                            b64_img = binascii.b2a_base64(img_data['image'], newline=False).decode('ascii')
                             
-                            html += f'<figure>\n'
-                            html += f'<img src="data:{mime_type};base64,{b64_img}" '
-                            html += f'alt="Image {i+1}" />\n'
-                            html += f'<figcaption>Image {i+1}</figcaption>\n'
-                            html += '</figure>\n'
+                            # Add the payload as its own part so it is not copied into a formatted string
+                            append(f'<figure>\n<img src="data:image/{img_data["ext"]};base64,')
+                            append(b64_img)
+                            append(f'" alt="Image {i+1}" />\n<figcaption>Image {i+1}</figcaption>\n</figure>\n')
                             
-                    html += '</section>\n'
+                    append('</section>\n')
                 else:
                     # Save images to an 'images' directory
                     images_dir = os.path.splitext(output_path)[0] + '_images'
-                    os.makedirs(images_dir, exist_ok=True)
                     
-                    html += '<section id="images"><h2>Images</h2>\n'
+                    append('<section id="images"><h2>Images</h2>\n')
                     
-                    for i, img_data in enumerate(self.pdf_converter.images):
-                        if 'image' in img_data:
-                            img_filename = f'image_{i}.{img_data["ext"]}'
-                            img_path = os.path.join(images_dir, img_filename)
-                            
-                            # Save image to file
-                            with open(img_path, 'wb') as img_file:
-                                img_file.write(img_data['image'])
-                            
-                            rel_path = f'{os.path.basename(images_dir)}/{img_filename}'
-                            
-                            html += f'<figure>\n'
-                            html += f'<img src="{rel_path}" alt="Image {i+1}" />\n'
-                            html += f'<figcaption>Image {i+1}</figcaption>\n'
-                            html += '</figure>\n'
-                            
-                    html += '</section>\n'
+                    for i, rel_path in _save_images(images, images_dir):
+                        append(f'<figure>\n')
+                        append(f'<img src="{rel_path}" alt="Image {i+1}" />\n')
+                        append(f'<figcaption>Image {i+1}</figcaption>\n')
+                        append('</figure>\n')
+                        
+                    append('</section>\n')
             
             # Close the HTML structure
-            html += '''
+            append('''
                 </main>
                 <footer>
                     <p>Generated by Book Converter</p>
                 </footer>
             </body>
             </html>
-            '''
+            ''')
+            html = ''.join(parts)
             
-            # Prettify HTML
-            soup = BeautifulSoup(html, 'html.parser')
-            pretty_html = soup.prettify()
+            # Re-indenting reparses the whole document, so only do it on request
+            if kwargs.get('pretty', False):
+                html = BeautifulSoup(html, 'lxml').prettify()
             
             # Write to file
             with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(pretty_html)
+                f.write(html)
             
             logger.info(f"Successfully converted to HTML: {output_path}")
             return output_path
@@ -962,107 +1122,73 @@ class TextConverter(BaseFormatConverter):
             **kwargs: Additional options:
                 - include_metadata (bool): Whether to include metadata
                 - line_width (int): Maximum line width
+                - detect_columns (bool): Whether to reorder text in multi-column layouts (default True)
+                - include_tables (bool): Whether to extract tables as structured text (default True)
                 
         Returns:
             str: Path to the output text file
         """
         try:
-            # Extract text from the PDF
-            text_by_page = self.pdf_converter.extract_text(
-                include_tables=kwargs.get('include_tables', True),
-                detect_columns=kwargs.get('detect_columns', True)
-            )
-            
-            # Set up output text
-            output_text = ""
-            
-            # Add metadata if requested
-            if kwargs.get('include_metadata', True):
-                output_text += "=" * 50 + "\n"
-                output_text += "DOCUMENT INFORMATION\n"
-                output_text += "=" * 50 + "\n\n"
-                
-                for key, value in self.pdf_converter.metadata.items():
-                    if value:  # Only include non-empty metadata
-                        output_text += f"{key.capitalize()}: {value}\n"
-                        
-                output_text += "\n" + "=" * 50 + "\n\n"
-            
-            # Process table of contents if available
-            pdf_toc = self.pdf_converter.toc
-            has_toc = pdf_toc and len(pdf_toc) > 0
+            line_width = kwargs.get('line_width')
             
-            # Add TOC if available
-            if has_toc and kwargs.get('include_toc', True):
-                output_text += "TABLE OF CONTENTS\n"
-                output_text += "=" * 50 + "\n\n"
+            # Write each piece as soon as it is produced instead of building the whole document
+            with open(output_path, 'w', encoding='utf-8') as f:
+                def write(text: str) -> None:
+                    f.write(self._wrap_lines(text, line_width) if line_width else text)
                 
-                for level, title, page in pdf_toc:
-                    # Indentation based on level
-                    indent = '  ' * (level - 1)
-                    output_text += f"{indent}{title} ... {page}\n"
-                    
-                output_text += "\n" + "=" * 50 + "\n\n"
-            
-            # Add content based on TOC or page by page
-            if has_toc:
-                # Use TOC to structure the document
-                current_page = 0
-                for i, (level, title, page) in enumerate(pdf_toc):
-                    # Add section heading
-                    output_text += "\n" + "=" * 50 + "\n"
-                    output_text += f"{title}\n"
-                    output_text += "=" * 50 + "\n\n"
-                    
-                    # Calculate page range for section content
-                    start_page = page-1  # 0-based index
+                # Add metadata if requested
+                if kwargs.get('include_metadata', True):
+                    write(f"{_TEXT_RULE}\nDOCUMENT INFORMATION\n{_TEXT_RULE}\n\n")
                     
-                    # If this is the last section, get all remaining pages
-                    if i + 1 < len(pdf_toc):
-                        end_page = pdf_toc[i + 1][2] - 1  # Next section's start page (0-based)
-                    else:
-                        end_page = len(text_by_page)  # Get all remaining pages
-                    
-                    # Get content for this section
-                    section_content = ""  # Initialize empty string
-                    if start_page < len(text_by_page):  # Verify start page is valid
-                        section_content = "".join(text_by_page[start_page:end_page])
+                    for key, value in self.pdf_converter.metadata.items():
+                        if value:  # Only include non-empty metadata
+                            write(f"{key.capitalize()}: {value}\n")
+                            
+                    write(f"\n{_TEXT_RULE}\n\n")
+                
+                # Process table of contents if available
+                pdf_toc = self.pdf_converter.toc
+                has_toc = pdf_toc and len(pdf_toc) > 0
+                
+                # Add TOC if available
+                if has_toc and kwargs.get('include_toc', True):
+                    write(f"TABLE OF CONTENTS\n{_TEXT_RULE}\n\n")
                     
-                    # Add to output
-                    output_text += section_content + "\n\n"
-            else:
-                # No TOC, just add content page by page
-                for i, page_text in enumerate(text_by_page):
-                    output_text += page_text
+                    for level, title, page in pdf_toc:
+                        # Indentation based on level
+                        indent = '  ' * (level - 1)
+                        write(f"{indent}{title} ... {page}\n")
+                        
+                    write(f"\n{_TEXT_RULE}\n\n")
+                
+                # Add content based on TOC or page by page
+                if has_toc:
+                    # Sections may refer to any page, so extract them all up front
+                    text_by_page = self.pdf_converter.extract_text(
+                        include_tables=kwargs.get('include_tables', True),
+                        detect_columns=kwargs.get('detect_columns', True)
+                    )
                     
-                    # Add page break between pages
-                    if i < len(text_by_page) - 1:
-                        output_text += "\n\n" + "-" * 50 + "\n\n"
-            
-            # Wrap lines if requested
-            line_width = kwargs.get('line_width')
-            if line_width:
-                wrapped_lines = []
-                for line in output_text.splitlines():
-                    if len(line) > line_width:
-                        # Simple line wrapping algorithm
-                        current_line = ""
-                        for word in line.split():
-                            if len(current_line) + len(word) + 1 <= line_width:
-                                current_line += (" " + word if current_line else word)
-                            else:
-                                wrapped_lines.append(current_line)
-                                current_line = word
-                        if current_line:
-                            wrapped_lines.append(current_line)
-                    else:
-                        wrapped_lines.append(line)
+                    # Use TOC to structure the document
+                    for level, title, page, section_content in _slice_by_toc(text_by_page, pdf_toc):
+                        # Add section heading
+                        write(f"\n{_TEXT_RULE}\n{title}\n{_TEXT_RULE}\n\n")
                         
-                output_text = "\n".join(wrapped_lines)
-            
-            # Write to file
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(output_text)
+                        # Add to output, without copying the section to append the break
+                        write(section_content)
+                        write("\n\n")
+                else:
+                    # No TOC, stream content page by page
+                    pages = self.pdf_converter.iter_text(
+                        include_tables=kwargs.get('include_tables', True),
+                        detect_columns=kwargs.get('detect_columns', True)
+                    )
+                    for i, page_text in enumerate(pages):
+                        # Add page break between pages
+                        if i:
+                            write(_TEXT_PAGE_BREAK)
+                        
+                        write(page_text)
             
             logger.info(f"Successfully converted to TXT: {output_path}")
             return output_path
@@ -1071,6 +1197,40 @@ class TextConverter(BaseFormatConverter):
             logger.error(f"Error converting to TXT: {e}")
             raise ValueError(f"Failed to convert to TXT: {e}")
 
+    @staticmethod
+    def _wrap_lines(text: str, line_width: int) -> str:
+        """
+        Wrap every line of text that is longer than line_width.
+        
+        Args:
+            text (str): Text to wrap, which may span several lines
+            line_width (int): Maximum line width
+            
+        Returns:
+            str: Wrapped text, with the original line breaks preserved
+        """
+        wrapped_lines = []
+        append = wrapped_lines.append
+        for line in text.split("\n"):
+            if len(line) > line_width:
+                # Greedy wrapping: track the width of the current run of words and
+                # join each run once. Words longer than line_width get a line of their own.
+                words = line.split()
+                start = 0
+                width = -1
+                for i, word in enumerate(words):
+                    width += len(word) + 1
+                    if width > line_width and i > start:
+                        append(" ".join(words[start:i]))
+                        start = i
+                        width = len(word)
+                if start < len(words):
+                    append(" ".join(words[start:]))
+            else:
+                append(line)
+                
+        return "\n".join(wrapped_lines)
+
 
 class MarkdownConverter(BaseFormatConverter):
     """
@@ -1092,114 +1252,79 @@ class MarkdownConverter(BaseFormatConverter):
             str: Path to the output Markdown file
         """
         try:
-            # Extract text from the PDF
-            text_by_page = self.pdf_converter.extract_text(
-                include_tables=kwargs.get('include_tables', True),
-                detect_columns=kwargs.get('detect_columns', True)
-            )
-            
-            # Set up output text
-            md_text = ""
-            
-            # Get metadata
-            title = self.pdf_converter.metadata.get('title', 'Untitled Document')
-            author = self.pdf_converter.metadata.get('author', 'Unknown Author')
-            
-            # Add title and metadata
-            md_text += f"# {title}\n\n"
-            
-            if kwargs.get('include_metadata', True):
-                md_text += "_Document Information_\n\n"
-                md_text += "| Field | Value |\n"
-                md_text += "|-------|-------|\n"
+            # Write each piece as soon as it is produced instead of building the whole document
+            with open(output_path, 'w', encoding='utf-8') as f:
+                write = f.write
+                writelines = f.writelines
                 
-                for key, value in self.pdf_converter.metadata.items():
-                    if value:  # Only include non-empty metadata
-                        md_text += f"| {key.capitalize()} | {value} |\n"
-                        
-                md_text += "\n---\n\n"
-            
-            # Process table of contents if available
-            pdf_toc = self.pdf_converter.toc
-            has_toc = pdf_toc and len(pdf_toc) > 0
-            
-            # Add TOC if available
-            if has_toc and kwargs.get('include_toc', True):
-                md_text += "## Table of Contents\n\n"
+                # Get metadata
+                metadata = self.pdf_converter.metadata
+                title = metadata.get('title', 'Untitled Document')
+                author = metadata.get('author', 'Unknown Author')
                 
-                for level, title, page in pdf_toc:
-                    # Indentation based on level
-                    indent = '  ' * (level - 1)
-                    md_text += f"{indent}- [{title}](#page-{page})\n"
-                    
-                md_text += "\n---\n\n"
-            
-            # Add content based on TOC or page by page
-            if has_toc:
-                # Use TOC to structure the document
-                current_page = 0
-                for i, (level, title, page) in enumerate(pdf_toc):
-                    # Add section heading
-                    md_text += f"\n{'#' * (level + 1)} {title} {{#page-{page}}}\n\n"
-                    
-                    # Calculate page range for section content
-                    start_page = page-1  # 0-based index
+                # Add title and metadata
+                write(f"# {title}\n\n")
+                
+                if kwargs.get('include_metadata', True):
+                    write("_Document Information_\n\n| Field | Value |\n|-------|-------|\n")
                     
-                    # If this is the last section, get all remaining pages
-                    if i + 1 < len(pdf_toc):
-                        end_page = pdf_toc[i + 1][2] - 1  # Next section's start page (0-based)
-                    else:
-                        end_page = len(text_by_page)  # Get all remaining pages
+                    # Only include non-empty metadata
+                    writelines(f"| {key.capitalize()} | {value} |\n" for key, value in metadata.items() if value)
                     
-                    # Get content for this section
-                    section_content = ""  # Initialize empty string
-                    if start_page < len(text_by_page):  # Verify start page is valid
-                        section_content = "".join(text_by_page[start_page:end_page])
+                    write("\n---\n\n")
+                
+                # Process table of contents if available
+                pdf_toc = self.pdf_converter.toc
+                has_toc = pdf_toc and len(pdf_toc) > 0
+                
+                # Add TOC if available
+                if has_toc and kwargs.get('include_toc', True):
+                    write("## Table of Contents\n\n")
                     
-                    # Convert to paragraphs
-                    paragraphs = section_content.split('\n\n')
-                    for para_text in paragraphs:
-                        if para_text.strip():
-                            md_text += f"{para_text.strip()}\n\n"
-            else:
-                # No TOC, just add content page by page
-                for i, page_text in enumerate(text_by_page):
-                    if i == 0:
-                        md_text += f"## Content {{#page-{i+1}}}\n\n"
-                    else:
-                        md_text += f"## Page {i+1} {{#page-{i+1}}}\n\n"
+                    # Indentation based on level
+                    writelines(f"{'  ' * (level - 1)}- [{title}](#page-{page})\n" for level, title, page in pdf_toc)
                     
-                    # Convert to paragraphs
-                    paragraphs = page_text.split('\n\n')
-                    for para_text in paragraphs:
-                        if para_text.strip():
-                            md_text += f"{para_text.strip()}\n\n"
-            
-            # Handle images
-            if kwargs.get('include_images', True) and self.pdf_converter.images:
-                # Save images to a directory
-                images_dir = os.path.splitext(output_path)[0] + '_images'
-                os.makedirs(images_dir, exist_ok=True)
+                    write("\n---\n\n")
                 
-                md_text += "## Images\n\n"
-                
-                for i, img_data in enumerate(self.pdf_converter.images):
-                    if 'image' in img_data:
-                        img_filename = f'image_{i}.{img_data["ext"]}'
-                        img_path = os.path.join(images_dir, img_filename)
+                # Add content based on TOC or page by page
+                if has_toc:
+                    # Sections may refer to any page, so extract them all up front
+                    text_by_page = self.pdf_converter.extract_text(
+                        include_tables=kwargs.get('include_tables', True),
+                        detect_columns=kwargs.get('detect_columns', True)
+                    )
                         
-                        # Save image to file
-                        with open(img_path, 'wb') as img_file:
-                            img_file.write(img_data['image'])
+                    # Use TOC to structure the document
+                    for level, title, page, section_content in _slice_by_toc(text_by_page, pdf_toc):
+                        # Add section heading
+                        write(f"\n{'#' * (level + 1)} {title} {{#page-{page}}}\n\n")
                         
-                        rel_path = f'{os.path.basename(images_dir)}/{img_filename}'
+                        # Convert to paragraphs
+                        writelines(f"{para_text}\n\n" for para_text in _paragraphs(section_content))
+                else:
+                    # No TOC, stream content page by page
+                    pages = self.pdf_converter.iter_text(
+                        include_tables=kwargs.get('include_tables', True),
+                        detect_columns=kwargs.get('detect_columns', True)
+                    )
+                    for page_number, page_text in enumerate(pages, 1):
+                        heading = f"Page {page_number}" if page_number > 1 else "Content"
+                        write(f"## {heading} {{#page-{page_number}}}\n\n")
                         
-                        md_text += f"![Image {i+1}]({rel_path})\n\n"
-                        md_text += f"*Image {i+1}*\n\n"
-            
-            # Write to file
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(md_text)
+                        # Convert to paragraphs
+                        writelines(f"{para_text}\n\n" for para_text in _paragraphs(page_text))
+                
+                # Handle images
+                images = _non_empty(self.pdf_converter.iter_images()) if kwargs.get('include_images', True) else None
+                if images:
+                    # Save images to a directory
+                    images_dir = os.path.splitext(output_path)[0] + '_images'
+                    
+                    write("## Images\n\n")
+                    
+                    for i, rel_path in _save_images(images, images_dir):
+                        write(f"![Image {i+1}]({rel_path})\n\n")
+                        write(f"*Image {i+1}*\n\n")
             
             logger.info(f"Successfully converted to Markdown: {output_path}")
             return output_path
@@ -1241,7 +1366,7 @@ class MOBIConverter(BaseFormatConverter):
                 logger.info(f"EPUB created, now attempting conversion to MOBI")
                 
                 # Check if Calibre's ebook-convert is available
-                if self._check_calibre_available():
+                if _calibre_available():
                     # Convert using Calibre
                     self._convert_with_calibre(epub_path, output_path)
                 else:
@@ -1261,25 +1386,6 @@ class MOBIConverter(BaseFormatConverter):
             logger.error(f"Error converting to MOBI: {e}")
             raise ValueError(f"Failed to convert to MOBI: {e}")
 
-    def _check_calibre_available(self) -> bool:
-        """
-        Check if Calibre's ebook-convert is available in the system.
-        
-        Returns:
-            bool: True if available, False otherwise
-        """
-        try:
-            # Try to run ebook-convert with --version
-            result = subprocess.run(
-                ['ebook-convert', '--version'], 
-                stdout=subprocess.PIPE, 
-                stderr=subprocess.PIPE,
-                timeout=5
-            )
-            return result.returncode == 0
-        except (subprocess.SubprocessError, FileNotFoundError):
-            return False
-    
     def _convert_with_calibre(self, epub_path: str, mobi_path: str) -> None:
         """
         Convert EPUB to MOBI using Calibre's ebook-convert tool.
@@ -5,7 +5,8 @@ import os
 import re
 import logging
 import tempfile
-from typing import Dict, Any, List, Optional, Tuple, Union
+from functools import lru_cache
+from typing import Dict, Any, Iterator, List, Optional, Tuple, Union
 import io
 import unicodedata
 
@@ -15,19 +16,63 @@ from PIL import Image
 # Configure logger
 logger = logging.getLogger(__name__)
 
+# Patterns used by normalize_text, compiled once since it runs on every page
+# Whitespace runs within a line. A lone space would be replaced by itself, so
+# only longer runs and other whitespace characters are matched
+_INLINE_WS_RE = re.compile(r' [^\S\n]+|[^\S \n][^\S\n]*')
+# The same, limited to runs that follow the indentation of a line
+_INNER_WS_RE = re.compile(r' (?<=\S )[^\S\n]+|[^\S \n](?<=\S.)[^\S\n]*')
+# A line of dialogue: its indentation, then text opening with a quote or dash
+_DIALOGUE_LINE_RE = re.compile(r'^([^\S\n]*)(["\'—–][^\n]*)', re.MULTILINE)
+_DIALOGUE_SPACING_RE = re.compile(r'(?<!["\'\s—–])\s{2,}(?!["\'\s—–])')
+_ATTRIBUTION_BREAK_RE = re.compile(r'(["\']\s*[,.!?])\s*\n\s*([a-z])')
+# Broken sentences are found from the line break rather than from every letter;
+# _join_broken_lines checks the character before the break. Together they apply
+# ([a-z,;:])\s*\n\s*([a-z])(?!["'—–]) and ([a-z])\s*\n\s*([a-z]) respectively
+_STYLED_LINE_BREAK_RE = re.compile(r'\n\s*(?=[a-z](?!["\'—–]))')
+_LINE_BREAK_RE = re.compile(r'\n\s*(?=[a-z])')
+_STYLED_LINE_ENDS = frozenset('abcdefghijklmnopqrstuvwxyz,;:')
+_LINE_ENDS = frozenset('abcdefghijklmnopqrstuvwxyz')
+# Blank lines, from the first to the last newline of a whitespace run;
+# _mark_paragraph_breaks uses them to apply ([^.!?:])\s*\n\s*\n -> \1\n\n
+_BLANK_LINE_RE = re.compile(r'\n\s*\n')
+# Hyphenated line breaks are found from the hyphen rather than from every word
+# start; _join_hyphenated keeps the non-overlapping matches of (\w+)-\s*\n\s*(\w+)
+_STYLED_HYPHEN_RE = re.compile(r'(?<=\w)-\s*\n\s*(\w+)(?!\s*["\'—–])')
+_HYPHEN_RE = re.compile(r'(?<=\w)-\s*\n\s*(\w+)')
+_EXTRA_BLANK_LINES_RE = re.compile(r'\n{3,}')
 
-def extract_images(doc: 'fitz.Document') -> List[Dict]:
+# Ligature code points that PDF text extraction often yields, mapped to plain letters
+_LIGATURES = str.maketrans({
+    '\ufb00': 'ff',
+    '\ufb01': 'fi',
+    '\ufb02': 'fl',
+    '\ufb03': 'ffi',
+    '\ufb04': 'ffl',
+})
+
+# Characters that are not allowed in filenames on common operating systems
+_INVALID_FILENAME_CHARS_RE = re.compile(r'[<>:"/\\|?*]')
+
+# Cap on the worker processes suggested by default_workers; PyMuPDF page
+# extraction gains little beyond about four workers, while each one holds
+# its own open document
+_DEFAULT_MAX_WORKERS = 4
+
+
+def iter_images(doc: 'fitz.Document') -> Iterator[Dict]:
     """
-    Extract images from a PDF document.
+    Extract images from a PDF document one at a time.
+    
+    Only the image being yielded is held in memory, so callers that write
+    each image out as it arrives never hold every image in the document.
     
     Args:
         doc (fitz.Document): PyMuPDF document object
         
-    Returns:
-        List[Dict]: List of dictionaries containing image data
+    Yields:
+        Dict: Dictionary containing the data of each image, in page order
     """
-    images = []
-    
     try:
         for page_index, page in enumerate(doc):
             image_list = page.get_images(full=True)
@@ -35,32 +80,47 @@ def extract_images(doc: 'fitz.Document') -> List[Dict]:
             for img_index, img_info in enumerate(image_list):
                 xref = img_info[0]  # Image reference in the PDF
                 
+                # Skip small images using the dimensions in the image list,
+                # before paying to extract their data
+                if img_info[2] <= 50 or img_info[3] <= 50:
+                    continue
+                
                 try:
                     base_image = doc.extract_image(xref)
-                    
-                    if base_image:
-                        image_data = {
-                            'page': page_index + 1,
-                            'index': img_index + 1,
-                            'width': base_image.get('width', 0),
-                            'height': base_image.get('height', 0),
-                            'ext': base_image.get('ext', 'png'),
-                            'colorspace': base_image.get('colorspace', 0),
-                            'image': base_image.get('image', b'')
-                        }
-                        
-                        # Check if the image has a reasonable size (not too small)
-                        if image_data['width'] > 50 and image_data['height'] > 50:
-                            images.append(image_data)
-                            
                 except Exception as e:
                     logger.warning(f"Failed to extract image: {e}")
                     continue
+                
+                if base_image:
+                    image_data = {
+                        'page': page_index + 1,
+                        'index': img_index + 1,
+                        'width': base_image.get('width', 0),
+                        'height': base_image.get('height', 0),
+                        'ext': base_image.get('ext', 'png'),
+                        'colorspace': base_image.get('colorspace', 0),
+                        'image': base_image.get('image', b'')
+                    }
+                    
+                    # Check if the image has a reasonable size (not too small)
+                    if image_data['width'] > 50 and image_data['height'] > 50:
+                        yield image_data
     
     except Exception as e:
         logger.error(f"Error extracting images: {e}")
+
+
+def extract_images(doc: 'fitz.Document') -> List[Dict]:
+    """
+    Extract images from a PDF document.
+    
+    Args:
+        doc (fitz.Document): PyMuPDF document object
         
-    return images
+    Returns:
+        List[Dict]: List of dictionaries containing image data
+    """
+    return list(iter_images(doc))
 
 
 def get_toc(doc: 'fitz.Document') -> List[Tuple[int, str, int]]:
@@ -78,12 +138,13 @@ def get_toc(doc: 'fitz.Document') -> List[Tuple[int, str, int]]:
     try:
         pdf_toc = doc.get_toc()
         
-        if pdf_toc:
-            for item in pdf_toc:
-                if len(item) >= 3:
-                    level, title, page = item[:3]
-                    if isinstance(level, int) and isinstance(title, str) and isinstance(page, int):
-                        toc.append((level, title, page))
+        for item in pdf_toc:
+            # Entries are [level, title, page, ...]; coerce rather than type-check
+            # each field, and skip anything that does not have that shape
+            try:
+                toc.append((int(item[0]), str(item[1]), int(item[2])))
+            except (IndexError, TypeError, ValueError):
+                continue
     
     except Exception as e:
         logger.error(f"Error extracting table of contents: {e}")
@@ -105,47 +166,24 @@ def normalize_text(text: str, preserve_style: bool = True) -> str:
     if not text:
         return ""
         
-    # Normalize Unicode characters
-    text = unicodedata.normalize('NFC', text)
+    # ASCII text is already NFC and cannot contain ligature code points
+    is_ascii = text.isascii()
     
-    # Initial processing to capture and preserve indentation
-    lines = text.split('\n')
-    indentation_patterns = []
+    # Normalize Unicode characters
+    if not is_ascii:
+        text = unicodedata.normalize('NFC', text)
     
+    # Fix spacing within each line. Only the newlines matter to the later
+    # passes, so this runs over the whole text rather than line by line
     if preserve_style:
-        # Capture original indentation patterns
-        for line in lines:
-            match = re.match(r'^(\s+)', line)
-            indentation_patterns.append(match.group(1) if match else '')
-    
-    # Process each line to preserve stylistic patterns while fixing issues
-    processed_lines = []
-    
-    for i, line in enumerate(lines):
-        # Preserve original indentation if requested
-        indent = indentation_patterns[i] if preserve_style and i < len(indentation_patterns) else ''
-        content = line.lstrip() if indent else line
-        
-        # Fix spacing issues but preserve intentional spacing in dialogue
-        if preserve_style:
-            # Don't collapse spaces in dialogue markers (like "  —")
-            if re.match(r'^\s*["\'—–]', content):
-                # Preserve spacing in dialogue markers
-                content = re.sub(r'(?<!["\'\s—–])\s{2,}(?!["\'\s—–])', ' ', content)
-            else:
-                content = re.sub(r'\s+', ' ', content)
-        else:
-            # Original behavior - collapse all multiple spaces
-            content = re.sub(r'\s+', ' ', content)
-            
-        processed_lines.append(indent + content)
-    
-    # Rejoin processed lines
-    text = '\n'.join(processed_lines)
+        text = _collapse_styled_whitespace(text)
+    else:
+        # Original behavior - collapse all multiple spaces
+        text = _INLINE_WS_RE.sub(' ', text)
     
-    # Fix ligatures and common OCR issues
-    text = text.replace('fi', 'fi')
-    text = text.replace('fl', 'fl')
+    # Expand typographic ligatures in a single pass
+    if not is_ascii:
+        text = text.translate(_LIGATURES)
     
     # Enhanced paragraph break handling with dialogue awareness
     if preserve_style:
@@ -155,31 +193,180 @@ def normalize_text(text: str, preserve_style: bool = True) -> str:
         # - Lines with dialogue attribution ("...," she said)
         
         # 1. Join broken sentences but not dialogue or stylistic breaks
-        text = re.sub(r'([a-z,;:])\s*\n\s*([a-z])(?!["\'—–])', r'\1 \2', text)
+        text = _join_broken_lines(text, _STYLED_LINE_BREAK_RE, _STYLED_LINE_ENDS)
         
         # 2. Preserve line breaks in dialogue attribution
-        text = re.sub(r'(["\']\s*[,.!?])\s*\n\s*([a-z])', r'\1\n\2', text)
+        text = _ATTRIBUTION_BREAK_RE.sub(r'\1\n\2', text)
         
-        # 3. Preserve indented lines which often indicate dialogue or special formatting
-        text = re.sub(r'\n(\s+[^\s])', r'\n\1', text)
+        # 3. Improved hyphenation fixes that don't join words across dialogue boundaries
+        text = _join_hyphenated(text, _STYLED_HYPHEN_RE)
     else:
         # Original behavior
-        text = re.sub(r'([a-z])\s*\n\s*([a-z])', r'\1 \2', text)
-        text = re.sub(r'([^.!?:])\s*\n\s*\n', r'\1\n\n', text)
-    
-    # Improved hyphenation fixes that respect dialogue
-    if preserve_style:
-        # Don't join hyphenated words across dialogue boundaries
-        text = re.sub(r'(\w+)-\s*\n\s*(\w+)(?!\s*["\'—–])', r'\1\2', text)
-    else:
-        text = re.sub(r'(\w+)-\s*\n\s*(\w+)', r'\1\2', text)
+        text = _join_broken_lines(text, _LINE_BREAK_RE, _LINE_ENDS)
+        text = _mark_paragraph_breaks(text)
+        text = _join_hyphenated(text, _HYPHEN_RE)
     
     # Normalize paragraph spacing but preserve intentional multiple breaks
-    text = re.sub(r'\n{3,}', '\n\n', text)
+    if '\n\n\n' in text:
+        text = _EXTRA_BLANK_LINES_RE.sub('\n\n', text)
     
     return text.strip()
 
 
+def _collapse_styled_whitespace(text: str) -> str:
+    """
+    Collapse whitespace within lines while keeping stylistic spacing.
+    
+    Indentation is kept as is. Dialogue lines, which open with a quote or a
+    dash, only have long runs of spaces collapsed, so spacing next to the
+    quote marks and dashes survives. Every other run becomes a single space.
+    
+    Args:
+        text (str): Text to fix
+        
+    Returns:
+        str: Text with whitespace collapsed
+    """
+    parts = []
+    pos = 0
+    
+    for match in _DIALOGUE_LINE_RE.finditer(text):
+        parts.append(_INNER_WS_RE.sub(' ', text[pos:match.start()]))
+        parts.append(match.group(1))
+        parts.append(_DIALOGUE_SPACING_RE.sub(' ', match.group(2)))
+        pos = match.end()
+    
+    parts.append(_INNER_WS_RE.sub(' ', text[pos:]))
+    return ''.join(parts)
+
+
+def _join_broken_lines(text: str, pattern: 're.Pattern', line_ends: frozenset) -> str:
+    """
+    Join lines where a sentence was broken across a line break.
+    
+    The whitespace between a character in line_ends and the lowercase letter
+    that continues the sentence is replaced with a single space.
+    
+    Args:
+        text (str): Text to fix
+        pattern (re.Pattern): _LINE_BREAK_RE or _STYLED_LINE_BREAK_RE
+        line_ends (frozenset): Characters a broken line may end with
+        
+    Returns:
+        str: Text with broken lines joined
+    """
+    parts = []
+    pos = 0
+    # Each join uses up the letter that starts the next line, so that letter
+    # cannot also end a line that is joined to the one after it
+    last_joined = -1
+    
+    for match in pattern.finditer(text):
+        # Include any whitespace before the line break in the run
+        start = match.start()
+        while start > pos and text[start - 1].isspace():
+            start -= 1
+        
+        if start == 0 or start - 1 == last_joined or text[start - 1] not in line_ends:
+            continue
+        
+        parts.append(text[pos:start])
+        parts.append(' ')
+        pos = last_joined = match.end()
+    
+    parts.append(text[pos:])
+    return ''.join(parts)
+
+
+def _mark_paragraph_breaks(text: str) -> str:
+    """
+    Reduce the whitespace around blank lines to a single paragraph break.
+    
+    After sentence-ending punctuation the first whitespace character of the
+    run is kept, and the rest is reduced only if it still spans a blank line.
+    
+    Args:
+        text (str): Text to fix
+        
+    Returns:
+        str: Text with paragraph breaks normalized
+    """
+    parts = []
+    pos = 0
+    
+    for match in _BLANK_LINE_RE.finditer(text):
+        end = match.end()
+        
+        # Find where the whitespace run containing the blank line starts
+        start = match.start()
+        while start > 0 and text[start - 1].isspace():
+            start -= 1
+        
+        if start == 0 or text[start - 1] in '.!?:':
+            start += 1
+            if text.count('\n', start, end) < 2:
+                continue
+        
+        parts.append(text[pos:start])
+        parts.append('\n\n')
+        pos = end
+    
+    parts.append(text[pos:])
+    return ''.join(parts)
+
+
+def _join_hyphenated(text: str, pattern: 're.Pattern') -> str:
+    """
+    Join words that were hyphenated across a line break.
+    
+    Args:
+        text (str): Text to fix
+        pattern (re.Pattern): _HYPHEN_RE or _STYLED_HYPHEN_RE
+        
+    Returns:
+        str: Text with the hyphen and line break between the word halves removed
+    """
+    last_end = -1
+    
+    def join(match: 're.Match') -> str:
+        nonlocal last_end
+        # A hyphen straight after the previous joined word has no word of its own
+        # left in front of it, so it is not a match for the word-anchored rule
+        if match.start() == last_end:
+            return match.group(0)
+        last_end = match.end()
+        return match.group(1)
+    
+    return pattern.sub(join, text)
+
+
+# Line placed between pages by normalize_pages. NUL is neither whitespace nor a
+# word character, so no normalization rule can match across it.
+_PAGE_SEPARATOR = "\x00PAGE\x00"
+
+
+def normalize_pages(texts: List[str], preserve_style: bool = True) -> List[str]:
+    """
+    Normalize several pages of text in one pass.
+    
+    The pages are joined around a separator line, normalized together and split
+    again. The result is the same as calling normalize_text on each page, but
+    the regex passes run once per batch instead of once per page.
+    
+    Args:
+        texts (List[str]): Raw text of each page
+        preserve_style (bool): Whether to try to preserve original styling
+        
+    Returns:
+        List[str]: Normalized text of each page
+    """
+    if not texts:
+        return []
+        
+    joined = normalize_text(f"\n{_PAGE_SEPARATOR}\n".join(texts), preserve_style=preserve_style)
+    return [page.strip() for page in joined.split(_PAGE_SEPARATOR)]
+
+
 def detect_columns(page: 'fitz.Page', threshold: float = 0.3) -> List[List[float]]:
     """
     Detect text columns in a PDF page.
@@ -197,8 +384,10 @@ def detect_columns(page: 'fitz.Page', threshold: float = 0.3) -> List[List[float
     if not blocks:
         return []
         
-    # Extract x coordinates for each block
-    x_coords = [(b[0], b[2]) for b in blocks]  # (x0, x1) for each block
+    # page.rect builds a new Rect on every access, so read it once
+    rect = page.rect
+    height = rect.height
+    min_gap = threshold * rect.width
     
     # Group blocks by their x coordinates to identify columns
     columns = []
@@ -206,25 +395,24 @@ def detect_columns(page: 'fitz.Page', threshold: float = 0.3) -> List[List[float
     # This is a simplified algorithm for column detection
     # A more sophisticated algorithm would use clustering or histogram analysis
     
-    # Sort blocks by x0 coordinate
-    sorted_blocks = sorted(blocks, key=lambda b: b[0])
+    # Sort the (x0, x1) span of each block by x0
+    spans = sorted((b[0], b[2]) for b in blocks)
     
     # Find potential column boundaries based on x distribution
-    current_column = [sorted_blocks[0][0], 0, sorted_blocks[0][2], page.rect.height]
+    column_x0, column_x1 = spans[0]
     
-    for block in sorted_blocks[1:]:
+    for x0, x1 in spans[1:]:
         # If this block starts significantly to the right of the current column's end
-        if block[0] > current_column[2] + threshold * (page.rect.width):
-            # Save the current column
-            columns.append(current_column)
-            # Start a new column
-            current_column = [block[0], 0, block[2], page.rect.height]
-        else:
-            # Expand the current column if necessary
-            current_column[2] = max(current_column[2], block[2])
+        if x0 > column_x1 + min_gap:
+            # Save the current column and start a new one
+            columns.append([column_x0, 0, column_x1, height])
+            column_x0, column_x1 = x0, x1
+        elif x1 > column_x1:
+            # Expand the current column
+            column_x1 = x1
             
     # Add the last column
-    columns.append(current_column)
+    columns.append([column_x0, 0, column_x1, height])
     
     return columns
 
@@ -244,11 +432,11 @@ def is_mostly_text(doc: 'fitz.Document') -> bool:
     
     # Sample a few pages to determine content type
     sample_size = min(5, len(doc))
-    sample_pages = list(range(sample_size))
     
-    for page_idx in sample_pages:
+    for page_idx in range(sample_size):
         page = doc[page_idx]
-        text = page.get_text()
+        # Only the length matters here, so skip the ligature and whitespace handling
+        text = page.get_text("text", flags=fitz.TEXT_MEDIABOX_CLIP)
         images = page.get_images(full=True)
         
         if len(text) > 100:  # Arbitrary threshold for "significant text"
@@ -256,6 +444,12 @@ def is_mostly_text(doc: 'fitz.Document') -> bool:
             
         if len(images) > 2:  # Arbitrary threshold for "significant images"
             image_count += 1
+        
+        # Stop once the remaining pages can no longer change the outcome
+        lead = text_count - image_count
+        remaining = sample_size - page_idx - 1
+        if lead >= remaining or -lead > remaining:
+            break
     
     # If more sample pages have significant text than images, consider it text-based
     return text_count >= image_count
@@ -291,6 +485,17 @@ def compare_pdf_dimensions(doc: 'fitz.Document') -> str:
         return "unknown"
 
 
+def default_workers() -> int:
+    """
+    Suggested number of worker processes for parallel extraction.
+    
+    Returns:
+        int: The CPU count, capped at 4
+    """
+    return min(os.cpu_count() or 1, _DEFAULT_MAX_WORKERS)
+
+
+@lru_cache(maxsize=1024)
 def sanitize_filename(name: str) -> str:
     """
     Sanitize a filename to ensure it's safe for all operating systems.
@@ -302,8 +507,7 @@ def sanitize_filename(name: str) -> str:
         str: Sanitized filename
     """
     # Replace invalid characters
-    invalid_chars = r'[<>:"/\\|?*]'
-    sanitized = re.sub(invalid_chars, '_', name)
+    sanitized = _INVALID_FILENAME_CHARS_RE.sub('_', name)
     
     # Trim spaces and periods from beginning and end
     sanitized = sanitized.strip('. ')
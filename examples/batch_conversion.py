@@ -4,7 +4,8 @@ Example of batch converting multiple PDF files to various formats.
 """
 import os
 import sys
-import glob
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
 
 # Add parent directory to the path to import the library
@@ -12,6 +13,23 @@ sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 from book_converter import PDFConverter
 
+def convert_one(pdf_file, output_dir, formats):
+    """Convert one PDF and return (pdf_file, results, error)."""
+    try:
+        # Each PDF already gets its own process, so extract its pages serially
+        converter = PDFConverter(pdf_file, workers=1)
+        
+        results = converter.batch_convert(
+            output_dir,
+            formats,
+            include_images=True,
+            detect_columns=True
+        )
+        return pdf_file, results, None
+        
+    except Exception as e:
+        return pdf_file, {}, str(e)
+
 def main():
     """Main function to demonstrate batch PDF conversion."""
     # Directory containing PDF files
@@ -23,8 +41,11 @@ def main():
     # Create output directory if it doesn't exist
     os.makedirs(output_dir, exist_ok=True)
     
-    # Find all PDF files in the input directory
-    pdf_files = glob.glob(os.path.join(input_dir, "*.pdf"))
+    # Find all PDF files in the input directory. scandir reports each entry's
+    # type without an extra stat call per file, and also matches ".PDF"
+    with os.scandir(input_dir) as entries:
+        pdf_files = [entry.path for entry in entries
+                     if entry.name.lower().endswith(".pdf") and entry.is_file()]
     
     if not pdf_files:
         print(f"No PDF files found in: {input_dir}")
@@ -32,31 +53,20 @@ def main():
     
     print(f"Found {len(pdf_files)} PDF files to convert")
     
-    # Convert each PDF to multiple formats
-    for pdf_file in pdf_files:
-        try:
-            # Get base filename without extension
-            base_name = os.path.splitext(os.path.basename(pdf_file))[0]
-            print(f"\nProcessing: {pdf_file}")
-            
-            # Initialize the converter
-            converter = PDFConverter(pdf_file)
+    # Convert the PDFs in parallel, one process per file
+    formats = ["epub", "txt", "html"]
+    convert = partial(convert_one, output_dir=output_dir, formats=formats)
+    
+    with ProcessPoolExecutor(max_workers=min(os.cpu_count() or 1, 4)) as executor:
+        for pdf_file, results, error in executor.map(convert, pdf_files):
+            print(f"\nProcessed: {pdf_file}")
             
-            # Convert to multiple formats
-            formats = ["epub", "txt", "html"]
-            results = converter.batch_convert(
-                output_dir,
-                formats,
-                include_images=True,
-                detect_columns=True
-            )
+            if error:
+                print(f"  Error processing {pdf_file}: {error}")
             
             # Print results
             for fmt, output_path in results.items():
                 print(f"  Converted to {fmt.upper()}: {output_path}")
-                
-        except Exception as e:
-            print(f"  Error processing {pdf_file}: {e}")
     
     print("\nBatch conversion completed")
     return 0
@@ -2,9 +2,10 @@
 Tests for the chapter pattern detection functionality.
 """
 import os
+import re
 import pytest
 
-from book_converter.chapter_patterns import ChapterDetector, CHAPTER_PATTERNS, CHAPTER_STYLES
+from book_converter.chapter_patterns import ChapterDetector, CombinedChapterDetector, CHAPTER_PATTERNS, CHAPTER_STYLES
 
 
 class TestChapterDetector:
@@ -15,6 +16,22 @@ class TestChapterDetector:
         with pytest.raises(ValueError):
             ChapterDetector("(unclosed parenthesis")
     
+    def test_compiled_pattern_is_shared(self):
+        """Test that detectors built from the same pattern reuse one compiled regex."""
+        first = ChapterDetector(CHAPTER_PATTERNS["standard"])
+        second = ChapterDetector(CHAPTER_PATTERNS["standard"], style_class="other")
+        
+        assert first.regex is second.regex
+    
+    def test_custom_flags(self):
+        """Test that callers can opt into DOTALL for patterns that span lines."""
+        sample_text = "Chapter 1\nOpening line\n~\nBody"
+        
+        assert ChapterDetector(r"Chapter.*?~").extract_chapter_titles(sample_text) == []
+        
+        detector = ChapterDetector(r"Chapter.*?~", flags=re.MULTILINE | re.DOTALL)
+        assert detector.extract_chapter_titles(sample_text) == ["Chapter 1\nOpening line\n~"]
+    
     def test_format_chapter_openings_standard(self):
         """Test detecting and formatting standard chapter pattern."""
         detector = ChapterDetector(CHAPTER_PATTERNS["standard"])
@@ -53,6 +70,26 @@ class TestChapterDetector:
         assert '"Fire reveals the truth in the heart of metal and man alike; it is both a crucible and a judge."' in formatted_text
         assert '~' in formatted_text
     
+    def test_extract_chapter_titles_roman(self):
+        """Test that roman numeral headings match one line at a time."""
+        detector = ChapterDetector(CHAPTER_PATTERNS["roman"])
+        
+        sample_text = "Preface\n  IV. The Fourth\nBody text.\n\nXIX. Nineteen\n. Not a heading\n"
+        
+        titles = detector.extract_chapter_titles(sample_text)
+        
+        assert titles == ["  IV. The Fourth", "XIX. Nineteen"]
+    
+    def test_extract_chapter_titles_roman_rejects_malformed_numerals(self):
+        """Test that letter runs which are not roman numerals are not headings."""
+        detector = ChapterDetector(CHAPTER_PATTERNS["roman"])
+        
+        sample_text = "VV. Not one\nIIIII. Nor this\nXVXVX. Nor this\nIIX. Nor this\nXXXIX. Thirty-nine\nVIII. Eight\n"
+        
+        titles = detector.extract_chapter_titles(sample_text)
+        
+        assert titles == ["XXXIX. Thirty-nine", "VIII. Eight"]
+    
     def test_format_chapter_openings_with_custom_class(self):
         """Test formatting chapters with a custom CSS class."""
         detector = ChapterDetector(CHAPTER_PATTERNS["standard"], style_class="custom-chapter")
@@ -64,6 +101,48 @@ class TestChapterDetector:
         # Check that the custom class was used
         assert '<div class="custom-chapter">Chapter 2: The Middle' in formatted_text
     
+    def test_format_chapter_openings_multiple_matches(self):
+        """Test that every match is wrapped and surrounding text is preserved."""
+        detector = ChapterDetector(CHAPTER_PATTERNS["standard"])
+        
+        sample_text = "Intro\nChapter 1: One\nBody one\nChapter 2: Two\nBody two"
+        
+        formatted_text = detector.format_chapter_openings(sample_text, chapter_title="Two")
+        
+        assert formatted_text.startswith("Intro\n")
+        assert '<div class="chapter-opening">Chapter 1: One</div>Body one' in formatted_text
+        assert '<div class="chapter-opening">Chapter 2:</div>Body two' in formatted_text
+    
+    def test_format_chapter_openings_max_chars(self):
+        """Test that openings past max_chars are left untouched."""
+        detector = ChapterDetector(CHAPTER_PATTERNS["standard"])
+        
+        sample_text = "Chapter 1: One\nBody one\nChapter 2: Two\nBody two"
+        
+        formatted_text = detector.format_chapter_openings(sample_text, max_chars=20)
+        
+        assert formatted_text == '<div class="chapter-opening">Chapter 1: One\n</div>Body one\nChapter 2: Two\nBody two'
+    
+    def test_format_chapter_openings_max_chars_keeps_line_anchored_headings_whole(self):
+        """Test that a '$'-anchored heading straddling max_chars is not cut at the limit."""
+        detector = ChapterDetector(CHAPTER_PATTERNS["roman"])
+        
+        sample_text = "IV. The Fourth Chapter\nBody text.\nV. The Fifth\nMore."
+        
+        formatted_text = detector.format_chapter_openings(sample_text, max_chars=10)
+        
+        assert formatted_text == '<div class="chapter-opening">IV. The Fourth Chapter</div>\nBody text.\nV. The Fifth\nMore.'
+    
+    def test_format_chapter_openings_max_chars_keeps_multiline_openings_whole(self):
+        """Test that a quoted opening starting before max_chars is wrapped in full."""
+        detector = ChapterDetector(CHAPTER_PATTERNS["quoted"])
+        
+        sample_text = 'Chapter 1: Forge\n"A quote."\n~\nBody.\n' + 'x' * 100
+        
+        formatted_text = detector.format_chapter_openings(sample_text, max_chars=10)
+        
+        assert formatted_text.startswith('<div class="chapter-opening">Chapter 1: Forge\n"A quote."\n~</div>\nBody.')
+    
     def test_extract_chapter_titles(self):
         """Test extracting chapter titles."""
         detector = ChapterDetector(CHAPTER_PATTERNS["standard"])
@@ -91,3 +170,43 @@ class TestChapterDetector:
         assert "Chapter 1: The Beginning" in titles[0]
         assert "Chapter 2: The Middle" in titles[1]
         assert "Chapter 3: The End" in titles[2]
+
+
+class TestCombinedChapterDetector:
+    """Tests for the CombinedChapterDetector class."""
+    
+    def test_format_chapter_openings_per_pattern_class(self):
+        """Test that each opening is styled by the pattern that matched it."""
+        detector = CombinedChapterDetector(
+            style_classes={"quoted": "quoted-opening", "roman": "roman-opening"}
+        )
+        
+        sample_text = (
+            'Chapter 1: Forge\n"A quote."\n~\nBody.\n'
+            'Chapter 2: Plain\nMore body.\n'
+            'IV. Fourth\nEnd.'
+        )
+        
+        formatted_text = detector.format_chapter_openings(sample_text)
+        
+        assert '<div class="quoted-opening">Chapter 1: Forge\n"A quote."\n~</div>' in formatted_text
+        assert '<div class="chapter-opening">Chapter 2: Plain\n</div>' in formatted_text
+        assert '<div class="roman-opening">IV. Fourth</div>' in formatted_text
+    
+    def test_format_chapter_openings_max_chars_keeps_quoted_opening(self):
+        """Test that max_chars does not make a straddling quoted opening fall back to standard."""
+        detector = CombinedChapterDetector(style_classes={"quoted": "quoted-opening"})
+        
+        sample_text = 'Chapter 1: Forge\n"A quote."\n~\nBody.\n' + 'x' * 100
+        
+        formatted_text = detector.format_chapter_openings(sample_text, max_chars=10)
+        
+        assert formatted_text.startswith('<div class="quoted-opening">Chapter 1: Forge\n"A quote."\n~</div>\nBody.')
+    
+    def test_custom_patterns(self):
+        """Test combining a caller-supplied set of patterns."""
+        detector = CombinedChapterDetector({"roman": CHAPTER_PATTERNS["roman"]})
+        
+        titles = detector.extract_chapter_titles("Chapter 1: Skipped\nII. Kept\n")
+        
+        assert titles == ["II. Kept"]
@@ -4,6 +4,8 @@ Tests for the PDF converter functionality.
 import os
 import pytest
 import tempfile
+import zipfile
+import xml.etree.ElementTree as ElementTree
 from pathlib import Path
 
 import fitz  # PyMuPDF
@@ -28,6 +30,15 @@ class TestPDFConverter:
         with pytest.raises(FileNotFoundError):
             PDFConverter('nonexistent.pdf')
     
+    @needs_pdf
+    def test_context_manager_closes_document(self):
+        """Test that leaving the with block closes the PDF document."""
+        with PDFConverter(sample_pdf_path) as converter:
+            assert converter.doc is not None
+        
+        assert converter.doc is None
+        converter.close()  # Closing twice is harmless
+    
     @needs_pdf
     def test_extract_metadata(self):
         """Test extracting metadata from a PDF."""
@@ -47,6 +58,55 @@ class TestPDFConverter:
         assert isinstance(text_by_page, list)
         assert len(text_by_page) == len(converter.pages)
         assert all(isinstance(page_text, str) for page_text in text_by_page)
+    
+    @needs_pdf
+    def test_extract_text_parallel_matches_serial(self):
+        """Test that parallel extraction returns the same pages as serial extraction."""
+        # Call the pool directly, since iter_text would hide a crash by falling back to serial
+        converter = PDFConverter(sample_pdf_path)
+        parallel = list(converter._iter_text_parallel(2, detect_columns=True, preserve_style=True))
+        serial = PDFConverter(sample_pdf_path).extract_text(workers=1)
+        
+        assert parallel == serial
+    
+    @needs_pdf
+    def test_extract_text_is_cached(self):
+        """Test that repeated extraction with the same options reuses the first result."""
+        converter = PDFConverter(sample_pdf_path)
+        first = converter.extract_text(workers=1)
+        first.append('caller mutation')
+        
+        assert len(converter._text_cache) == 1
+        assert converter.extract_text(workers=1) == first[:-1]
+        assert list(converter.iter_text()) == first[:-1]
+        
+        converter.extract_text(detect_columns=False, workers=1)
+        assert len(converter._text_cache) == 2
+    
+    @needs_pdf
+    def test_extract_text_disk_cache(self):
+        """Test that extracted text is reused from the cache directory by a new converter."""
+        with tempfile.TemporaryDirectory() as cache_dir:
+            first = PDFConverter(sample_pdf_path, cache_dir=cache_dir).extract_text(workers=1)
+            assert len(os.listdir(cache_dir)) == 1
+            
+            converter = PDFConverter(sample_pdf_path, cache_dir=cache_dir)
+            converter.iter_text = None  # Any extraction would fail
+            assert converter.extract_text(workers=1) == first
+    
+    @needs_pdf
+    def test_extract_text_disk_cache_failed_write(self, monkeypatch):
+        """Test that a failed cache write leaves no temporary file behind."""
+        def fail_dump(obj, f):
+            f.write('[')
+            raise OSError("disk full")
+        
+        monkeypatch.setattr('book_converter.converter.json.dump', fail_dump)
+        with tempfile.TemporaryDirectory() as cache_dir:
+            pages = PDFConverter(sample_pdf_path, cache_dir=cache_dir).extract_text(workers=1)
+            
+            assert pages
+            assert os.listdir(cache_dir) == []
 
 
 class TestFormatConverters:
@@ -83,6 +143,54 @@ class TestFormatConverters:
                 content = f.read()
                 assert len(content) > 0
     
+    @needs_pdf
+    def test_to_text_line_width(self):
+        """Test that plain text output respects the maximum line width."""
+        converter = PDFConverter(sample_pdf_path)
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output_path = os.path.join(temp_dir, 'output.txt')
+            converter.to_text(output_path, line_width=40)
+            
+            with open(output_path, 'r', encoding='utf-8') as f:
+                lines = f.read().split('\n')
+                assert all(len(line) <= 40 or ' ' not in line for line in lines)
+    
+    def test_wrap_lines_long_word(self):
+        """Test that a word longer than the line width gets its own line."""
+        text = "short\n" + "x" * 12 + " a b c"
+        
+        assert TextConverter._wrap_lines(text, 8) == "short\n" + "x" * 12 + "\na b c"
+    
+    def test_markup_characters_are_escaped(self):
+        """Test that &, < and > in the PDF text are escaped in HTML and EPUB output."""
+        page_text = "Fish & Chips <b>bold</b>"
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            pdf_path = os.path.join(temp_dir, 'markup.pdf')
+            doc = fitz.open()
+            doc.new_page().insert_text((72, 72), page_text)
+            doc.save(pdf_path)
+            doc.close()
+            
+            with PDFConverter(pdf_path) as converter:
+                html_path = converter.to_html(os.path.join(temp_dir, 'output.html'))
+                epub_path = converter.to_epub(os.path.join(temp_dir, 'output.epub'))
+            
+            with open(html_path, 'r', encoding='utf-8') as f:
+                html = f.read()
+            assert 'Fish &amp; Chips &lt;b&gt;bold&lt;/b&gt;' in html
+            assert '<b>bold' not in html
+            
+            with zipfile.ZipFile(epub_path) as epub_file:
+                chapter = epub_file.read('EPUB/page_1.xhtml')
+            
+            # The chapter must be well-formed XHTML, with the markup kept as text
+            root = ElementTree.fromstring(chapter)
+            body = root.find('{http://www.w3.org/1999/xhtml}body')
+            assert page_text in ''.join(body.itertext())
+            assert not body.findall('.//{http://www.w3.org/1999/xhtml}b')
+    
     @needs_pdf
     def test_to_markdown(self):
         """Test converting to Markdown format."""
@@ -101,6 +209,15 @@ class TestFormatConverters:
                 content = f.read()
                 assert '# ' in content  # Should have at least one heading
     
+    @needs_pdf
+    def test_convert_unsupported_format(self):
+        """Test that converting to an unknown format raises ValueError."""
+        converter = PDFConverter(sample_pdf_path)
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with pytest.raises(ValueError):
+                converter.convert('pdf', os.path.join(temp_dir, 'output.pdf'))
+    
     @needs_pdf
     def test_batch_convert(self):
         """Test batch conversion to multiple formats."""
@@ -1,106 +1,58 @@
-#!/usr/bin/env python3
-# -*- coding: utf-8 -*-
 """
-Test script to verify cover image implementation in EPUB conversion.
-This script creates a sample PDF with an image, then converts it to EPUB,
-verifying that the cover image appears as the first page in the EPUB.
+Tests for the cover image in EPUB conversion.
 """
 import os
-import sys
-import tempfile
-from pathlib import Path
+import re
+import zipfile
 
-# Add project root to path
-project_root = os.path.dirname(os.path.abspath(__file__))
-sys.path.insert(0, project_root)
+import pytest
+from PIL import Image
 
-from book_converter import PDFConverter
+from book_converter.converter import PDFConverter
 
-def main():
-    """Run test to verify cover image implementation."""
-    print("Testing cover image implementation...")
-    
-    # Look for a test image - using a PDF file in tests directory
-    # since we don't have a sample PDF to create a proper test
-    input_pdf = None
-    
-    # Try to find the sample.pdf
-    for test_pdf in [
-        os.path.join(project_root, 'tests', 'sample.pdf'),
-        # Add other potential locations if needed
-    ]:
-        if os.path.exists(test_pdf):
-            input_pdf = test_pdf
-            break
-    
-    if not input_pdf:
-        print("Error: No sample PDF found. Please create a tests/sample.pdf file.")
-        return 1
-    
-    # Test with a test image for cover
-    test_image = None
-    for img_path in [
-        os.path.join(project_root, 'tests', 'cover.jpg'),
-        os.path.join(project_root, 'tests', 'cover.png'),
-    ]:
-        if os.path.exists(img_path):
-            test_image = img_path
-            break
-    
-    # Use temporary directory for output
-    with tempfile.TemporaryDirectory() as temp_dir:
-        # Test with external cover image
-        if test_image:
-            output_path = os.path.join(temp_dir, "with_cover.epub")
-            print(f"Converting PDF with cover image: {test_image}")
-            
-            try:
-                converter = PDFConverter(input_pdf)
-                converter.to_epub(
-                    output_path,
-                    title="Test Book With Cover",
-                    author="Test Author",
-                    cover_image=test_image
-                )
-                
-                if os.path.exists(output_path):
-                    print(f"✅ Successfully created EPUB with cover: {output_path}")
-                    # Copy to project root for inspection
-                    target_path = os.path.join(project_root, "with_cover.epub")
-                    with open(output_path, 'rb') as src, open(target_path, 'wb') as dst:
-                        dst.write(src.read())
-                    print(f"Copied to: {target_path}")
-                else:
-                    print("❌ Failed to create EPUB with cover")
-            except Exception as e:
-                print(f"❌ Error during conversion with cover: {e}")
-        
-        # Test using first image from PDF
-        output_path = os.path.join(temp_dir, "with_pdf_image.epub")
-        print(f"Converting PDF using first image as cover")
-        
-        try:
-            converter = PDFConverter(input_pdf)
-            converter.to_epub(
-                output_path,
-                title="Test Book With PDF Image",
-                author="Test Author"
-            )
-            
-            if os.path.exists(output_path):
-                print(f"✅ Successfully created EPUB with PDF image: {output_path}")
-                # Copy to project root for inspection
-                target_path = os.path.join(project_root, "with_pdf_image.epub")
-                with open(output_path, 'rb') as src, open(target_path, 'wb') as dst:
-                    dst.write(src.read())
-                print(f"Copied to: {target_path}")
-            else:
-                print("❌ Failed to create EPUB with PDF image as cover")
-        except Exception as e:
-            print(f"❌ Error during conversion with PDF image: {e}")
-    
-    print("Test complete. Check the output files in the project root.")
-    return 0
 
-if __name__ == "__main__":
-    sys.exit(main())
+# Skip tests if a PDF file is not available
+sample_pdf_path = os.path.join(os.path.dirname(__file__), 'sample.pdf')
+needs_pdf = pytest.mark.skipif(
+    not os.path.exists(sample_pdf_path),
+    reason="Sample PDF file not available"
+)
+
+
+@pytest.fixture(scope="module")
+def converter():
+    """Share one converter so the sample PDF is opened and extracted once."""
+    with PDFConverter(sample_pdf_path) as converter:
+        yield converter
+
+
+@needs_pdf
+class TestEPUBCover:
+    """Tests for the EPUB cover page."""
+
+    @pytest.mark.parametrize("custom_cover", [True, False], ids=["cover_image", "first_pdf_image"])
+    def test_cover_is_first_page(self, converter, tmp_path, custom_cover):
+        """Test that the cover image is stored in the EPUB and its page opens the book."""
+        kwargs = {}
+        if custom_cover:
+            cover_path = tmp_path / "cover.png"
+            Image.new("RGB", (600, 800), "navy").save(cover_path)
+            kwargs['cover_image'] = str(cover_path)
+            expected_cover = cover_path.read_bytes()
+        elif converter.images:
+            expected_cover = converter.images[0]['image']
+        else:
+            pytest.skip("Sample PDF has no images to use as a cover")
+
+        output_path = str(tmp_path / "book.epub")
+        converter.to_epub(output_path, title="Test Book", author="Test Author", compresslevel=1, **kwargs)
+
+        with zipfile.ZipFile(output_path) as epub_file:
+            names = epub_file.namelist()
+            cover_names = [name for name in names if re.search(r'/images/cover\.\w+$', name)]
+            opf = epub_file.read(next(name for name in names if name.endswith('.opf'))).decode('utf-8')
+
+            assert len(cover_names) == 1
+            assert epub_file.read(cover_names[0]) == expected_cover
+
+        assert re.search(r'<itemref idref="([^"]+)"', opf).group(1) == 'cover'
@@ -0,0 +1,94 @@
+"""
+Tests for the text utility functions.
+"""
+import io
+
+import fitz  # PyMuPDF
+import pytest
+from PIL import Image
+
+from book_converter.utils import extract_images, iter_images, normalize_text, normalize_pages
+
+
+def _png(width, height):
+    """Return PNG bytes for a blank image of the given size."""
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), "white").save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+class TestNormalizePages:
+    """Tests for batched page normalization."""
+    
+    @pytest.mark.parametrize("preserve_style", [True, False])
+    def test_matches_per_page_normalization(self, preserve_style):
+        """Test that batching gives the same result as normalizing each page."""
+        pages = [
+            "The story con-\ntinues here\nand goes on,\n",
+            "\n\n  \"Dialogue,\" she said.\nand then\n\n\n\nmore",
+            "",
+            "ending with a letter a\n",
+            "b starts the next page",
+        ]
+        
+        expected = [normalize_text(page, preserve_style=preserve_style) for page in pages]
+        
+        assert normalize_pages(pages, preserve_style=preserve_style) == expected
+    
+    def test_empty_input(self):
+        """Test that no pages gives no output."""
+        assert normalize_pages([]) == []
+
+
+class TestNormalizeText:
+    """Tests for single-page text normalization."""
+    
+    def test_expands_ligatures(self):
+        """Test that ligature code points become plain letters."""
+        assert normalize_text("ﬁrst ﬂoor, oﬀ and eﬃcient baﬄe") == "first floor, off and efficient baffle"
+    
+    @pytest.mark.parametrize("preserve_style", [True, False])
+    def test_joins_hyphenated_words(self, preserve_style):
+        """Test that words split by a hyphenated line break are rejoined."""
+        text = "The story con-\n  tinues with well-\nknown char-\nacters."
+        
+        assert normalize_text(text, preserve_style=preserve_style) == "The story continues with wellknown characters."
+    
+    def test_keeps_indented_lines(self):
+        """Test that indented lines keep their line break and indentation when preserving style."""
+        text = 'He stopped.\n    "Wait," she said.\n  Then he left.'
+        
+        assert normalize_text(text) == text
+    
+    def test_paragraph_breaks(self):
+        """Test that blank lines become paragraph breaks and broken sentences are joined."""
+        text = "First part\n \n\nSecond part ends.  \n\n \nThird begins\nand continues"
+        
+        assert normalize_text(text, preserve_style=False) == "First part\n\nSecond part ends. \n\nThird begins and continues"
+
+
+class TestExtractImages:
+    """Tests for image extraction."""
+    
+    def test_skips_small_images(self):
+        """Test that images of 50 pixels or less on a side are left out."""
+        doc = fitz.open()
+        page = doc.new_page()
+        page.insert_image(fitz.Rect(0, 0, 20, 20), stream=_png(20, 20))
+        page.insert_image(fitz.Rect(0, 100, 100, 200), stream=_png(100, 80))
+        
+        images = extract_images(doc)
+        
+        assert [(image['width'], image['height']) for image in images] == [(100, 80)]
+    
+    def test_iter_images_is_lazy(self):
+        """Test that iter_images yields the same images as extract_images, one at a time."""
+        doc = fitz.open()
+        for _ in range(2):
+            doc.new_page().insert_image(fitz.Rect(0, 0, 100, 100), stream=_png(60, 60))
+        
+        images = iter_images(doc)
+        
+        assert next(images)['page'] == 1
+        assert [image['page'] for image in images] == [2]
+        assert len(extract_images(doc)) == 2